@@ -1,12 +1,21 @@
+import ctypes
+import ctypes.util
+import heapq
+import mmap
+import os
 import sys
 import threading
 import time
+from array import array
+from collections import deque
+from dataclasses import dataclass, replace
+from functools import partial
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget,
     QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QTextEdit, QGroupBox, QMessageBox, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, Qt, QTimer
 from PyQt5.QtGui import QIcon
 
 try:
@@ -15,6 +24,11 @@ try:
 except ImportError:
     ON_PI = False
 
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
 MOTORS = [
     {'step': 17, 'dir': 27, 'start_pos': 'A'},
     {'step': 22, 'dir': 23, 'start_pos': 'B'},
@@ -22,64 +36,329 @@ MOTORS = [
 ]
 STEPS_PER_REV = 200
 ANGLE_TO_MOVE = 45
+# Status lines from worker threads are buffered and flushed to the log at this rate
+STATUS_FLUSH_MS = 100
+STATUS_BUFFER_LINES = 2000
+RETURN_SPEED_FACTOR = 0.5
+# Drivers latch on the rising edge and only need a ~2 µs high time, so each
+# step is a short pulse followed by one wait for the rest of the period.
+STEP_PULSE_NS = 2_000
+# Below this much remaining time we spin instead of sleeping; sleeps stop this
+# far short of the deadline so that wake-up latency is absorbed by the spin.
+SPIN_THRESHOLD_NS = 200_000
+SPIN_MARGIN_NS = 150_000
+
+# time.monotonic_ns() reads CLOCK_MONOTONIC on Linux, so its deadlines can be
+# handed straight to clock_nanosleep(TIMER_ABSTIME) without relative-sleep drift.
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
 
-def move_motor(step_pin, dir_pin, speed_rpm, angle, stop_event, motor_idx, status_callback, direction=True):
-    steps_needed = int(STEPS_PER_REV * angle / 360)
-    if speed_rpm <= 0:
+try:
+    _clock_nanosleep = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).clock_nanosleep
+except (OSError, AttributeError, TypeError):
+    _clock_nanosleep = None
+
+def sleep_until(deadline_ns):
+    """Sleep until the absolute CLOCK_MONOTONIC time deadline_ns."""
+    if _clock_nanosleep is None:
+        time.sleep(max(0, deadline_ns - time.monotonic_ns()) / 1e9)
         return
-    step_delay = 60.0 / (STEPS_PER_REV * speed_rpm) / 2
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+
+def wait_until(deadline_ns):
+    """Block until time.monotonic_ns() reaches deadline_ns (hybrid sleep + spin)."""
+    if deadline_ns - time.monotonic_ns() > SPIN_THRESHOLD_NS:
+        sleep_until(deadline_ns - SPIN_MARGIN_NS)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+# Stepping threads ask for SCHED_FIFO and the core isolated with isolcpus=3
+RT_PRIORITY = 80
+RT_CPU = 3
+RT_WARNED = False
+
+def promote_realtime(status_callback):
+    """Move the calling thread to SCHED_FIFO on RT_CPU, warning (once) if it isn't allowed."""
+    global RT_WARNED
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+        if RT_CPU < os.cpu_count():
+            os.sched_setaffinity(0, {RT_CPU})
+    except (AttributeError, OSError) as e:
+        if RT_WARNED:
+            return
+        RT_WARNED = True
+        status_callback(f"⚠️ Real-time scheduling unavailable ({e}); step timing is best-effort")
+
+# BCM283x GPIO block as exposed by /dev/gpiomem (32-bit word offsets)
+GPIOMEM_PATH = '/dev/gpiomem'
+GPIOMEM_SIZE = 4096
+GPSET0 = 0x1C // 4
+GPCLR0 = 0x28 // 4
+
+class GPIORegisters:
+    """Direct GPSET0/GPCLR0 writes through a /dev/gpiomem mapping.
+
+    Pin modes are still configured with RPi.GPIO; this only replaces
+    GPIO.output() for the step pulses, where one 32-bit store sets or clears
+    every pin in the mask.
+    """
+
+    def __init__(self):
+        fd = os.open(GPIOMEM_PATH, os.O_RDWR | os.O_SYNC)
+        try:
+            self._mem = mmap.mmap(fd, GPIOMEM_SIZE)
+        finally:
+            os.close(fd)
+        self._regs = memoryview(self._mem).cast('I')
+
+    def set(self, mask):
+        self._regs[GPSET0] = mask
+
+    def clear(self, mask):
+        self._regs[GPCLR0] = mask
+
+GPIO_REGS = None
+
+def open_gpio_registers():
+    """Map the GPIO registers, or return None where /dev/gpiomem is unusable (e.g. Pi 5)."""
+    try:
+        return GPIORegisters()
+    except (OSError, ValueError):
+        return None
+
+def step_writers(step_pin):
+    """Return (high, low) callables for step_pin, preferring direct register writes."""
+    if GPIO_REGS is not None:
+        mask = 1 << step_pin
+        return partial(GPIO_REGS.set, mask), partial(GPIO_REGS.clear, mask)
+    return partial(GPIO.output, step_pin, GPIO.HIGH), partial(GPIO.output, step_pin, GPIO.LOW)
+
+def mask_writers():
+    """Return (set, clear) callables taking a bitmask of pins, one register store each when mapped."""
+    if GPIO_REGS is not None:
+        return GPIO_REGS.set, GPIO_REGS.clear
+    def pins(mask):
+        return [pin for pin in range(mask.bit_length()) if mask >> pin & 1]
+    return (lambda mask: GPIO.output(pins(mask), GPIO.HIGH),
+            lambda mask: GPIO.output(pins(mask), GPIO.LOW))
+
+@dataclass(slots=True)
+class MotorConfig:
+    """Pins and timing for one motor, baked once per sequence from the GUI values."""
+    idx: int
+    step_pin: int
+    dir_pin: int
+    step_mask: int
+    dir_mask: int
+    period_ns: int  # half a step period at the configured speed
+    steps: int      # steps needed to reach the target angle
+    delay_ns: int   # start offset from the beginning of the sequence
+
+def motor_configs(speeds, angles, delays):
+    return [MotorConfig(idx, m['step'], m['dir'], 1 << m['step'], 1 << m['dir'],
+                        int(60e9 / (STEPS_PER_REV * speeds[idx]) / 2),
+                        int(STEPS_PER_REV * angles[idx] / 360),
+                        int(delays[idx] * 1e9))
+            for idx, m in enumerate(MOTORS)]
+
+# pigpio waves are clocked out by DMA, so while one is playing no Python code
+# sits on the step timing path. The daemon only plays one wave at a time, so
+# motors that move together share a single merged wave.
+WAVE_POLL_S = 0.01
+PIGPIO = None
+WAVE_LOCK = threading.Lock()
+
+def connect_pigpio():
+    """Connect to the pigpio daemon, or return None if it isn't installed/running."""
+    if pigpio is None:
+        return None
+    pi = pigpio.pi()
+    if not pi.connected:
+        return None
+    return pi
+
+def wave_fits(total_pulses):
+    return PIGPIO is not None and total_pulses <= PIGPIO.wave_get_max_pulses()
+
+def wave_pulses(step_pin, steps, period_ns, offset_ns=0):
+    """pigpio pulses for `steps` step pulses on step_pin, starting offset_ns into the wave."""
+    mask = 1 << step_pin
+    half_us = max(1, period_ns // 1000)
+    pulses = [pigpio.pulse(0, 0, offset_ns // 1000)] if offset_ns >= 1000 else []
+    return pulses + [pigpio.pulse(mask, 0, half_us), pigpio.pulse(0, mask, half_us)] * steps
+
+def wave_steps_done(elapsed_ns, steps, period_ns, offset_ns=0):
+    """Estimate how many of `steps` pulses went out in the first elapsed_ns of a wave."""
+    return max(0, min(steps, (elapsed_ns - offset_ns) // (2 * period_ns)))
+
+def send_wave(trains, stop_flag=None):
+    """Merge the pulse trains into one wave, send it and block until it is done.
+
+    Returns the nanoseconds spent transmitting so callers can tell how far each
+    motor got when stop_flag cut the wave short.
+    """
+    with WAVE_LOCK:
+        PIGPIO.wave_clear()
+        for pulses in trains:
+            PIGPIO.wave_add_generic(pulses)
+        wid = PIGPIO.wave_create()
+        started = time.monotonic_ns()
+        PIGPIO.wave_send_once(wid)
+        try:
+            while PIGPIO.wave_tx_busy():
+                if stop_flag is not None and stop_flag[0]:
+                    PIGPIO.wave_tx_stop()
+                    break
+                time.sleep(WAVE_POLL_S)
+        finally:
+            PIGPIO.wave_delete(wid)
+        return time.monotonic_ns() - started
+
+# (starting, finished) status text for outbound and return moves
+MOVE_MESSAGES = {
+    True: ("Moving to target position...", "Reached target position! Waiting 3 seconds..."),
+    False: ("Returning to start position...", "Returned to start position."),
+}
+
+def move_motors_wave(configs, stop_flag, status_callback, forward=True):
+    """Move several motors at once from a single merged pigpio wave.
+
+    Returns the number of steps each motor completed, keyed by motor index.
+    """
+    for cfg in configs:
+        GPIO.output(cfg.dir_pin, GPIO.HIGH if forward else GPIO.LOW)
+    elapsed_ns = send_wave([wave_pulses(cfg.step_pin, cfg.steps, cfg.period_ns, cfg.delay_ns)
+                            for cfg in configs], stop_flag)
+
+    done = {}
+    for cfg in configs:
+        done[cfg.idx] = wave_steps_done(elapsed_ns, cfg.steps, cfg.period_ns, cfg.delay_ns)
+        if done[cfg.idx] < cfg.steps:
+            status_callback(f"Motor {cfg.idx+1}: Stopped after {done[cfg.idx]}/{cfg.steps} steps.")
+        else:
+            status_callback(f"Motor {cfg.idx+1}: {MOVE_MESSAGES[forward][1]}")
+    return done
+
+# Edge kinds for the software step scheduler, in the order a motor goes through them
+EDGE_START, EDGE_HIGH, EDGE_LOW = 0, 1, 2
+
+def move_motors_scheduled(configs, stop_flag, status_callback, forward=True):
+    """Step several motors from one thread, always serving the earliest pending edge.
+
+    Takes the same configs as move_motors_wave and returns the same per-motor step
+    counts; this is the path used when no pigpio daemon is available. Edges
+    that fall due together are written with a single set/clear.
+    """
+    start = time.monotonic_ns()
+    heap = [(start + cfg.delay_ns, i, EDGE_START) for i, cfg in enumerate(configs)]
+    heapq.heapify(heap)
+    done = [0] * len(configs)
     if ON_PI:
-        GPIO.output(dir_pin, GPIO.HIGH if direction else GPIO.LOW)
-    
-    for step in range(steps_needed):
-        if stop_event.is_set():  # Check if STOP button pressed
-            status_callback(f"Motor {motor_idx+1}: Stopped after {step}/{steps_needed} steps.")
+        for cfg in configs:
+            GPIO.output(cfg.dir_pin, GPIO.HIGH if forward else GPIO.LOW)
+        set_pins, clear_pins = mask_writers()
+        promote_realtime(status_callback)
+    else:
+        set_pins = clear_pins = lambda mask: None
+
+    starting, finished = MOVE_MESSAGES[forward]
+
+    # Hot-loop names bound once; the heap is serviced per edge
+    push, pop, on_pi = heapq.heappush, heapq.heappop, ON_PI
+    while heap:
+        if stop_flag[0]:
+            for deadline, i, edge in heap:
+                cfg = configs[i]
+                if edge == EDGE_START:
+                    status_callback(f"Motor {cfg.idx+1}: Not started (stopped).")
+                else:
+                    status_callback(f"Motor {cfg.idx+1}: Stopped after {done[i]}/{cfg.steps} steps.")
             break
-        if ON_PI:
-            GPIO.output(step_pin, GPIO.HIGH)
-            time.sleep(step_delay)
-            GPIO.output(step_pin, GPIO.LOW)
-            time.sleep(step_delay)
-        else:
-            # Simulation: comment out for hardware
-            if step % 25 == 0:
-                status_callback(f"[SIM] Motor {motor_idx+1}: step {step}/{steps_needed}")
-            time.sleep(step_delay*2)
-    
-    # Wait 3 seconds at target position
-    if not stop_event.is_set():
-        status_callback(f"Motor {motor_idx+1}: Reached target position! Waiting 3 seconds...")
-        time.sleep(3)
-
-def return_motor(step_pin, dir_pin, speed_rpm, steps_to_return, motor_idx, status_callback, direction=True, return_speed_factor=0.5):
+        deadline = heap[0][0]
+        wait_until(deadline)
+        rising = falling = 0
+        while heap and heap[0][0] <= deadline:
+            _, i, edge = pop(heap)
+            cfg = configs[i]
+            if edge == EDGE_START:
+                status_callback(f"Motor {cfg.idx+1}: {starting}")
+                if cfg.steps > 0:
+                    push(heap, (deadline, i, EDGE_HIGH))
+            elif edge == EDGE_HIGH:
+                rising |= cfg.step_mask
+                push(heap, (deadline + STEP_PULSE_NS, i, EDGE_LOW))
+            else:
+                falling |= cfg.step_mask
+                if not on_pi and done[i] % 25 == 0:
+                    status_callback(f"[SIM] Motor {cfg.idx+1}: step {done[i]}/{cfg.steps}")
+                done[i] += 1
+                if done[i] < cfg.steps:
+                    push(heap, (deadline - STEP_PULSE_NS + 2 * cfg.period_ns, i, EDGE_HIGH))
+                else:
+                    status_callback(f"Motor {cfg.idx+1}: {finished}")
+        if rising:
+            set_pins(rising)
+        if falling:
+            clear_pins(falling)
+    return {cfg.idx: done[i] for i, cfg in enumerate(configs)}
+
+def pick_mover(configs):
+    """The merged pigpio wave when the daemon can hold it, else the software scheduler."""
+    if ON_PI and wave_fits(sum(2 * cfg.steps + 1 for cfg in configs)):
+        return move_motors_wave
+    return move_motors_scheduled
+
+def return_configs(configs, steps_moved, return_speed_factor=RETURN_SPEED_FACTOR):
+    """Configs that take each moved motor back by its steps_moved at the return speed."""
+    return [replace(cfg, steps=steps_moved[cfg.idx], delay_ns=0,
+                    period_ns=int(cfg.period_ns / return_speed_factor))
+            for cfg in configs if steps_moved[cfg.idx] > 0]
+
+def return_motor(cfg, steps_to_return, status_callback, direction=True, return_speed_factor=RETURN_SPEED_FACTOR):
+    motor_idx = cfg.idx
     if steps_to_return <= 0:
         status_callback(f"Motor {motor_idx+1}: Already at start position.")
         return
     
-    return_speed = speed_rpm * return_speed_factor
-    step_delay = 60.0 / (STEPS_PER_REV * return_speed) / 2
+    period_ns = int(cfg.period_ns / return_speed_factor)
     if ON_PI:
-        GPIO.output(dir_pin, GPIO.LOW if direction else GPIO.HIGH)  # Reverse direction
+        GPIO.output(cfg.dir_pin, GPIO.LOW if direction else GPIO.HIGH)  # Reverse direction
+        step_high, step_low = step_writers(cfg.step_pin)
+        promote_realtime(status_callback)
     
     status_callback(f"Motor {motor_idx+1}: Returning {steps_to_return} steps to start position...")
     
-    for step in range(steps_to_return):
-        if ON_PI:
-            GPIO.output(step_pin, GPIO.HIGH)
-            time.sleep(step_delay)
-            GPIO.output(step_pin, GPIO.LOW)
-            time.sleep(step_delay)
-        else:
-            if step % 25 == 0:
-                status_callback(f"[SIM] Motor {motor_idx+1}: returning step {step}/{steps_to_return}")
-            time.sleep(step_delay*2)
+    if ON_PI and wave_fits(2 * steps_to_return):
+        send_wave([wave_pulses(cfg.step_pin, steps_to_return, period_ns)])
+        status_callback(f"Motor {motor_idx+1}: Returned to start position.")
+        return
+
+    deadline = time.monotonic_ns()
+    if ON_PI:
+        for _ in range(steps_to_return):
+            step_high()
+            wait_until(deadline + STEP_PULSE_NS)
+            step_low()
+            deadline += 2 * period_ns
+            wait_until(deadline)
+    else:
+        for step in range(0, steps_to_return, 25):
+            status_callback(f"[SIM] Motor {motor_idx+1}: returning step {step}/{steps_to_return}")
+            deadline += 2 * period_ns * min(25, steps_to_return - step)
+            wait_until(deadline)
     
     status_callback(f"Motor {motor_idx+1}: Returned to start position.")
 
 class MotorControlApp(QMainWindow):
     finished = pyqtSignal()
-    motor_status = pyqtSignal(str)
     sequence_complete = pyqtSignal()
+    targets_reached = pyqtSignal()
+    motor_returned = pyqtSignal(int)
 
     def __init__(self):
         super().__init__()
@@ -96,15 +375,42 @@ class MotorControlApp(QMainWindow):
         self._init_config_tab()
         self._init_status_tab()
         self.finished.connect(self.show_finished)
-        self.motor_status.connect(self.append_status)
         self.sequence_complete.connect(self.on_sequence_complete)
-
-        self.stop_event = threading.Event()
+        self.targets_reached.connect(self._on_targets_reached)
+        self.motor_returned.connect(self._schedule_next_return)
+
+        # Worker threads queue status lines here; the GUI thread flushes them in batches
+        self._status_buf = deque(maxlen=STATUS_BUFFER_LINES)
+        self.queue_status = self._status_buf.append
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._drain_status)
+        self._flush_timer.start(STATUS_FLUSH_MS)
+
+        # A one-byte flag the step loops can read without taking a lock
+        self.stop_flag = array('B', [0])
         self.running_threads = []
         self.current_rep = 0
         self.total_reps = 1
         self.is_running_sequence = False
         self.steps_moved = [0, 0, 0]
+        self.configs = []
+
+        if ON_PI:
+            self._init_gpio()
+
+    def _init_gpio(self):
+        """Claim the motor pins and open the fast output paths once; cleanup happens on close."""
+        global GPIO_REGS, PIGPIO
+        GPIO.setmode(GPIO.BCM)
+        for m in MOTORS:
+            GPIO.setup(m['step'], GPIO.OUT, initial=GPIO.LOW)
+            GPIO.setup(m['dir'], GPIO.OUT, initial=GPIO.LOW)
+        GPIO_REGS = open_gpio_registers()
+        if GPIO_REGS is None:
+            self.append_status("⚠️ /dev/gpiomem unavailable, stepping through RPi.GPIO")
+        PIGPIO = connect_pigpio()
+        if PIGPIO is not None:
+            self.append_status("⚡ pigpio daemon found, step pulses are DMA-timed")
 
     def _init_config_tab(self):
         vbox = QVBoxLayout()
@@ -211,6 +517,13 @@ class MotorControlApp(QMainWindow):
         self.status_text.append(message)
         self.tabs.setCurrentWidget(self.status_tab)
 
+    def _drain_status(self):
+        lines = []
+        while self._status_buf:
+            lines.append(self._status_buf.popleft())
+        if lines:
+            self.append_status("\n".join(lines))
+
     def show_finished(self):
         self.append_status("✅ All sequences completed!")
         QMessageBox.information(self, "Done", "All sequences completed successfully!")
@@ -226,7 +539,7 @@ class MotorControlApp(QMainWindow):
             # Wait 2-5 seconds before next sequence
             wait_time = 2 if self.return_together_cb.isChecked() else 5
             self.append_status(f"⏳ Waiting {wait_time} seconds before next sequence...")
-            threading.Timer(wait_time, self.run_single_sequence).start()
+            QTimer.singleShot(int(wait_time * 1000), self.run_single_sequence)
         else:
             self.append_status("🎉 All sequences completed!")
             self.finished.emit()
@@ -241,13 +554,6 @@ class MotorControlApp(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         
-        # Initialize GPIO if on Raspberry Pi
-        if ON_PI:
-            GPIO.setmode(GPIO.BCM)
-            for m in MOTORS:
-                GPIO.setup(m['step'], GPIO.OUT)
-                GPIO.setup(m['dir'], GPIO.OUT)
-        
         # Start the first sequence
         self.run_single_sequence()
 
@@ -258,7 +564,7 @@ class MotorControlApp(QMainWindow):
             
         self.append_status(f"🔄 Running sequence {self.current_rep + 1}/{self.total_reps}")
         
-        self.stop_event.clear()
+        self.stop_flag[0] = 0
         self.steps_moved = [0, 0, 0]
         speeds = [spin.value() for spin in self.speed_spins]
         delays = [spin.value() for spin in self.delay_spins]
@@ -267,93 +573,89 @@ class MotorControlApp(QMainWindow):
         self.status_text.clear()
         self.append_status("🚦 Starting movement sequence...")
 
-        threads = []
-        for idx, m in enumerate(MOTORS):
-            def run_motor(idx=idx, m=m):
-                self.motor_status.emit(f"Motor {idx+1}: Will start after {delays[idx]:.1f}s delay ({speeds[idx]} RPM, {angles[idx]}°).")
-                time.sleep(delays[idx])
-                if self.stop_event.is_set():
-                    self.motor_status.emit(f"Motor {idx+1}: Not started (stopped).")
-                    return
-                self.motor_status.emit(f"Motor {idx+1}: Moving to target position...")
-                move_motor(m['step'], m['dir'], speeds[idx], angles[idx], self.stop_event, idx, self.motor_status.emit)
-                if not self.stop_event.is_set():
-                    self.motor_status.emit(f"Motor {idx+1}: Reached target and waited 3 seconds.")
-                    self.steps_moved[idx] = int(STEPS_PER_REV * angles[idx] / 360)
-            t = threading.Thread(target=run_motor)
-            threads.append(t)
-            t.start()
-
-        self.running_threads = threads
-
-        # Wait for all motors to complete and then return
-        def wait_and_return():
-            for t in threads:
-                t.join()
-            
-            if not self.is_running_sequence:
-                return
-                
-            self.append_status("⏳ All motors reached target. Starting return sequence...")
-            
-            if self.return_together_cb.isChecked():
-                # Return all motors together
-                self.return_all_motors_together(speeds)
-            else:
-                # Return motors individually
-                self.return_motors_individually(speeds)
-        
-        threading.Thread(target=wait_and_return, daemon=True).start()
+        self.configs = motor_configs(speeds, angles, delays)
+        move_motors = pick_mover(self.configs)
+
+        # One thread drives every motor; per-motor threads only added GIL hand-offs
+        def run_motors():
+            for idx in range(len(MOTORS)):
+                self.queue_status(f"Motor {idx+1}: Will start after {delays[idx]:.1f}s delay ({speeds[idx]} RPM, {angles[idx]}°).")
+            done = move_motors(self.configs, self.stop_flag, self.queue_status)
+            if not self.stop_flag[0]:
+                for idx, steps in done.items():
+                    self.steps_moved[idx] = steps
+                self.targets_reached.emit()
+
+        thread = threading.Thread(target=run_motors)
+        thread.start()
+        self.running_threads = [thread]
+
+    def _on_targets_reached(self):
+        # Hold the target position for 3 seconds before heading back
+        QTimer.singleShot(3000, self._start_return)
+
+    def _start_return(self):
+        if not self.is_running_sequence:
+            return
+        for idx in range(len(MOTORS)):
+            self.append_status(f"Motor {idx+1}: Reached target and waited 3 seconds.")
+        self.append_status("⏳ All motors reached target. Starting return sequence...")
+
+        if self.return_together_cb.isChecked():
+            # Return all motors together
+            self.return_all_motors_together()
+        else:
+            # Return motors individually
+            self.return_motors_individually()
 
-    def return_all_motors_together(self, speeds):
+    def return_all_motors_together(self):
         """Return all motors to start position together"""
-        return_threads = []
-        
-        for idx, m in enumerate(MOTORS):
-            if self.steps_moved[idx] > 0:
-                def return_motor(idx=idx, m=m):
-                    return_motor(m['step'], m['dir'], speeds[idx], self.steps_moved[idx], idx, self.motor_status.emit)
-                t = threading.Thread(target=return_motor)
-                return_threads.append(t)
-                t.start()
-        
-        # Wait for all return threads to complete
-        def finish_return():
-            for t in return_threads:
-                t.join()
+        configs = return_configs(self.configs, self.steps_moved)
+        if not configs:
+            self.sequence_complete.emit()
+            return
+
+        # The same single stepping thread (or merged wave) as the outbound move
+        move_motors = pick_mover(configs)
+        def _do_return():
+            move_motors(configs, self.stop_flag, self.queue_status, forward=False)
             if self.is_running_sequence:
                 self.sequence_complete.emit()
-        
-        threading.Thread(target=finish_return, daemon=True).start()
+        thread = threading.Thread(target=_do_return, daemon=True)
+        thread.start()
+        self.running_threads = [thread]
 
-    def return_motors_individually(self, speeds):
+    def return_motors_individually(self):
         """Return motors to start position one by one"""
-        def return_individual(idx=0):
-            if idx >= len(MOTORS) or not self.is_running_sequence:
-                self.sequence_complete.emit()
-                return
-                
-            if self.steps_moved[idx] > 0:
-                return_motor(MOTORS[idx]['step'], MOTORS[idx]['dir'], speeds[idx], self.steps_moved[idx], idx, self.motor_status.emit)
-            
-            # Wait before next motor returns
-            if idx < len(MOTORS) - 1:
-                time.sleep(1)
-            
-            # Return next motor
-            return_individual(idx + 1)
-        
-        threading.Thread(target=return_individual, daemon=True).start()
+        self._return_individual(0)
+
+    def _return_individual(self, idx):
+        """Return motor idx on a worker thread; motor_returned chains to the next one"""
+        # Motors that never moved need neither a return nor a gap
+        while idx < len(MOTORS) and self.steps_moved[idx] <= 0:
+            idx += 1
+        if idx >= len(MOTORS) or not self.is_running_sequence:
+            self.sequence_complete.emit()
+            return
+
+        cfg = self.configs[idx]
+        def run_return():
+            return_motor(cfg, self.steps_moved[idx], self.queue_status)
+            self.motor_returned.emit(idx)
+        threading.Thread(target=run_return, daemon=True).start()
+
+    def _schedule_next_return(self, idx):
+        # Wait before next motor returns
+        delay_ms = 1000 if any(self.steps_moved[idx + 1:]) else 0
+        QTimer.singleShot(delay_ms, partial(self._return_individual, idx + 1))
 
     def stop_motors(self):
         self.append_status("🛑 Stop requested. Halting all motors...")
         self.is_running_sequence = False
-        self.stop_event.set()
+        self.stop_flag[0] = 1
         # Wait for all threads to finish
         for t in getattr(self, 'running_threads', []):
             t.join(timeout=1)
-        if ON_PI:
-            GPIO.cleanup()
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
 
@@ -362,8 +664,8 @@ class MotorControlApp(QMainWindow):
         self.is_running_sequence = False
         
         # Stop any running motors first
-        if hasattr(self, 'stop_event'):
-            self.stop_event.set()
+        if hasattr(self, 'stop_flag'):
+            self.stop_flag[0] = 1
         
         # Wait for threads to finish
         if hasattr(self, 'running_threads'):
@@ -23,7 +23,7 @@ MOTORS = [
 STEPS_PER_REV = 200
 
 class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position):
+    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position, start_delay_ns=0):
         super().__init__()
         self.step_pin = step_pin
         self.dir_pin = dir_pin
@@ -35,8 +35,16 @@ class MotorThread(threading.Thread):
         self.direction = direction
         self.daemon = True
         self.start_position = start_position
+        self.start_delay_ns = start_delay_ns
 
     def run(self):
+        if self.start_delay_ns:
+            time.sleep(self.start_delay_ns / 1e9)
+        if not self.running_event.is_set():
+            return
+        self.status_callback(
+            f"Motor {self.idx+1}: started at speed {self.speed_rpm} RPM after {self.start_delay_ns / 1e9:.2f}s delay. [Start: {self.start_position}]"
+        )
         step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
         if ON_PI:
             GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
@@ -217,25 +225,20 @@ class MotorControlApp(QMainWindow):
 
         for idx, m in enumerate(MOTORS):
             self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                time.sleep(delays[idx])
-                self.motor_status.emit(
-                    f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.2f}s delay. [Start: {self.start_positions[idx]}]"
-                )
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.motor_status.emit,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx]
-                )
-                self.threads[idx] = thread
-                thread.start()
-            threading.Thread(target=run_motor).start()
+            thread = MotorThread(
+                step_pin=m['step'],
+                dir_pin=m['dir'],
+                speed_rpm=speeds[idx],
+                running_event=self.running_events[idx],
+                steps_moved=self.steps_moved,
+                idx=idx,
+                status_callback=self.motor_status.emit,
+                direction=True if self.start_positions[idx] == 'A' else False,
+                start_position=self.start_positions[idx],
+                start_delay_ns=int(delays[idx] * 1e9)
+            )
+            self.threads[idx] = thread
+            thread.start()
 
     def stop_motors(self):
         self.append_status("🛑 Stop pressed: halting and returning all motors to start position...")
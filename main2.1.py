@@ -2,6 +2,8 @@ import sys
 import threading
 import time
 import os
+from array import array
+from itertools import cycle, islice
 
 # Detect if running on Raspberry Pi
 try:
@@ -35,42 +37,96 @@ MOTORS = [
     {'step': 24, 'dir': 25}
 ]
 STEPS_PER_REV = 200
+# Below this much remaining time we spin instead of sleeping; sleeps stop this
+# far short of the deadline so that wake-up latency is absorbed by the spin.
+SPIN_THRESHOLD_NS = 200_000
+SPIN_MARGIN_NS = 150_000
+# Drivers latch on the rising edge and only need a ~2 µs high time
+STEP_PULSE_NS = 2_000
+
+# What happens after each step of a 50-step cycle: the direction reverses every
+# 25 steps, reporting "C" half-way and the start position at the end of the cycle.
+DIR_FLIP, AT_START = 1, 2
+STEP_CYCLE = bytes(DIR_FLIP if s == 25 else DIR_FLIP | AT_START if s == 50 else 0
+                   for s in range(1, 51))
+
+def wait_until(deadline_ns):
+    """Block until time.monotonic_ns() reaches deadline_ns (hybrid sleep + spin)."""
+    remaining = deadline_ns - time.monotonic_ns()
+    if remaining > SPIN_THRESHOLD_NS:
+        time.sleep((remaining - SPIN_MARGIN_NS) / 1e9)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+def pulse_hw(step_pin, deadline, period_ns):
+    """One step pulse starting at deadline; returns the deadline of the next one."""
+    GPIO.output(step_pin, GPIO.HIGH)
+    wait_until(deadline + STEP_PULSE_NS)
+    GPIO.output(step_pin, GPIO.LOW)
+    deadline += 2 * period_ns
+    wait_until(deadline)
+    return deadline
+
+def pulse_sim(step_pin, deadline, period_ns):
+    deadline += 2 * period_ns
+    wait_until(deadline)
+    return deadline
+
+# Chosen once so the step loops don't branch on ON_PI per step
+pulse = pulse_hw if ON_PI else pulse_sim
 
 class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position):
+    def __init__(self, step_pin, dir_pin, speed_rpm, steps_total, stop_flag, steps_moved, idx, status_callback, direction, start_position, start_delay_ns=0):
         super().__init__()
         self.step_pin = step_pin
         self.dir_pin = dir_pin
         self.speed_rpm = speed_rpm
-        self.running_event = running_event
+        self.steps_total = steps_total
+        self.stop_flag = stop_flag
         self.steps_moved = steps_moved
         self.idx = idx
         self.status_callback = status_callback
         self.direction = direction
         self.daemon = True
         self.start_position = start_position
+        self.start_delay_ns = start_delay_ns
 
     def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
-        if ON_PI:
-            GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-        while self.running_event.is_set():
-            if ON_PI:
-                GPIO.output(self.step_pin, GPIO.HIGH)
-                time.sleep(step_delay)
-                GPIO.output(self.step_pin, GPIO.LOW)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            self.steps_moved[self.idx] += 1
-            if self.steps_moved[self.idx] % 25 == 0:
-                self.direction = False if self.direction == True else True
-                if ON_PI:
-                    GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-            if self.steps_moved[self.idx] % 50 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: {self.start_position}")
-            elif self.steps_moved[self.idx] % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: C")
+        if self.start_delay_ns:
+            time.sleep(self.start_delay_ns / 1e9)
+        if self.stop_flag[0]:
+            return
+        self.status_callback(
+            f"Motor {self.idx+1}: started at speed {self.speed_rpm} RPM after {self.start_delay_ns / 1e9:.2f}s delay. [Start: {self.start_position}]"
+        )
+        period_ns = int(60e9 / (STEPS_PER_REV * self.speed_rpm) / 2)
+        # Bind everything the step loop touches to locals once
+        on_pi = ON_PI
+        step_pin, dir_pin, idx = self.step_pin, self.dir_pin, self.idx
+        stop_flag = self.stop_flag
+        status = self.status_callback
+        label = f"Motor {idx+1} moved: "
+        if on_pi:
+            out, high, low = GPIO.output, GPIO.HIGH, GPIO.LOW
+            out(dir_pin, high if self.direction else low)
+        moved = self.steps_moved[idx]
+        step_flags = islice(cycle(STEP_CYCLE), moved % 50, None)
+        deadline = time.monotonic_ns()
+        for _ in range(self.steps_total):
+            if stop_flag[0]:
+                break
+            deadline = pulse(step_pin, deadline, period_ns)
+            moved += 1
+            flags = next(step_flags)
+            if flags:
+                self.direction = not self.direction
+                if on_pi:
+                    out(dir_pin, high if self.direction else low)
+                self.steps_moved[idx] = moved
+                status(label + (self.start_position if flags & AT_START else "C"))
+        else:
+            status(f"Motor {idx+1}: finished {self.steps_total} steps.")
+        self.steps_moved[idx] = moved
 
 class ReturnThread(threading.Thread):
     def __init__(self, step_pin, dir_pin, speed_rpm, steps_to_return, idx, status_callback, direction, start_position):
@@ -86,29 +142,22 @@ class ReturnThread(threading.Thread):
         self.start_position = start_position
 
     def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
-        if ON_PI:
-            GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-        s = self.steps_to_return
-        while True:
-            if ON_PI:
-                GPIO.output(self.step_pin, GPIO.HIGH)
-                time.sleep(step_delay)
-                GPIO.output(self.step_pin, GPIO.LOW)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            s += 1
-            if s % 25 == 0:
-                self.direction = False if self.direction == True else True
-                if ON_PI:
-                    GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-
-            if s % 50 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: {self.start_position}")
-                break
-            elif s % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: C")
+        period_ns = int(60e9 / (STEPS_PER_REV * self.speed_rpm) / 2)
+        on_pi = ON_PI
+        step_pin, dir_pin = self.step_pin, self.dir_pin
+        label = f"Motor {self.idx+1} moved: "
+        if on_pi:
+            out, high, low = GPIO.output, GPIO.HIGH, GPIO.LOW
+            out(dir_pin, high if self.direction else low)
+        # Step through the rest of the current cycle, which ends at the start position
+        deadline = time.monotonic_ns()
+        for flags in STEP_CYCLE[self.steps_to_return % 50:]:
+            deadline = pulse(step_pin, deadline, period_ns)
+            if flags:
+                self.direction = not self.direction
+                if on_pi:
+                    out(dir_pin, high if self.direction else low)
+                self.status_callback(label + (self.start_position if flags & AT_START else "C"))
 
         self.status_callback(f"Motor {self.idx+1} returned to start position.")
 
@@ -134,17 +183,26 @@ class MotorControlApp(QMainWindow):
         self.motor_status.connect(self.append_status)
 
         self.steps_moved = [0, 0, 0]
-        self.running_events = [threading.Event() for _ in range(3)]
+        # Read by the step loops without a lock; set to 1 by Stop
+        self.stop_flag = array('B', [0])
         self.threads = [None, None, None]
         self.return_threads = []
         self.start_positions = ['A', 'A', 'A']  # default
 
+        # Pins are claimed once here and released in closeEvent
+        if ON_PI:
+            GPIO.setmode(GPIO.BCM)
+            for m in MOTORS:
+                GPIO.setup(m['step'], GPIO.OUT, initial=GPIO.LOW)
+                GPIO.setup(m['dir'], GPIO.OUT, initial=GPIO.LOW)
+
     def _init_config_tab(self):
         vbox = QVBoxLayout()
         group = QGroupBox("Configure Each Motor")
         form = QFormLayout()
         self.speed_spins = []
         self.delay_spins = []
+        self.steps_spins = []
         self.pos_combos = []
         for i in range(3):
             hbox = QHBoxLayout()
@@ -169,9 +227,16 @@ class MotorControlApp(QMainWindow):
             hbox.addWidget(QLabel("Delay (s):"))
             hbox.addWidget(delay_spin)
 
+            steps_spin = QSpinBox()
+            steps_spin.setRange(1, 100000)
+            steps_spin.setValue(1000)
+            hbox.addWidget(QLabel("Steps:"))
+            hbox.addWidget(steps_spin)
+
             form.addRow(f"Motor {i+1} Setup:", hbox)
             self.speed_spins.append(speed_spin)
             self.delay_spins.append(delay_spin)
+            self.steps_spins.append(steps_spin)
         group.setLayout(form)
         vbox.addWidget(group)
 
@@ -216,47 +281,36 @@ class MotorControlApp(QMainWindow):
         self.steps_moved = [0, 0, 0]
         speeds = [spin.value() for spin in self.speed_spins]
         delays = [spin.value() for spin in self.delay_spins]
-        if ON_PI:
-            GPIO.setmode(GPIO.BCM)
-            for m in MOTORS:
-                GPIO.setup(m['step'], GPIO.OUT)
-                GPIO.setup(m['dir'], GPIO.OUT)
+        steps_totals = [spin.value() for spin in self.steps_spins]
 
-        for evt in self.running_events:
-            evt.clear()
+        self.stop_flag[0] = 0
         self.return_threads = []
 
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
         for idx, m in enumerate(MOTORS):
-            self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                time.sleep(delays[idx])
-                self.motor_status.emit(
-                    f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.2f}s delay. [Start: {self.start_positions[idx]}]"
-                )
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.motor_status.emit,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx]
-                )
-                self.threads[idx] = thread
-                thread.start()
-            threading.Thread(target=run_motor).start()
+            thread = MotorThread(
+                step_pin=m['step'],
+                dir_pin=m['dir'],
+                speed_rpm=speeds[idx],
+                steps_total=steps_totals[idx],
+                stop_flag=self.stop_flag,
+                steps_moved=self.steps_moved,
+                idx=idx,
+                status_callback=self.motor_status.emit,
+                direction=True if self.start_positions[idx] == 'A' else False,
+                start_position=self.start_positions[idx],
+                start_delay_ns=int(delays[idx] * 1e9)
+            )
+            self.threads[idx] = thread
+            thread.start()
 
     def stop_motors(self):
         self.append_status("🛑 Stop pressed: halting and returning all motors to start position...")
         self.stop_btn.setEnabled(False)
 
-        for evt in self.running_events:
-            evt.clear()
+        self.stop_flag[0] = 1
         for t in self.threads:
             if t is not None:
                 t.join(timeout=2)
@@ -286,11 +340,18 @@ class MotorControlApp(QMainWindow):
         def finish_notice():
             for rt in self.return_threads:
                 rt.join()
-            if ON_PI:
-                GPIO.cleanup()
             self.finished.emit()
         threading.Thread(target=finish_notice, daemon=True).start()
 
+    def closeEvent(self, event):
+        self.stop_flag[0] = 1
+        for t in self.threads + self.return_threads:
+            if t is not None:
+                t.join(timeout=1)
+        if ON_PI:
+            GPIO.cleanup()
+        event.accept()
+
 if __name__ == "__main__":
     # Try different Qt platforms for Raspberry Pi
     if ON_PI:
@@ -1,7 +1,13 @@
+import ctypes
+import ctypes.util
 import sys
 import threading
 import time
 import os
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Detect if running on Raspberry Pi
 try:
@@ -38,16 +44,134 @@ MOTORS = [
     {'step': 23, 'dir': 22},
     {'step': 25, 'dir': 24}
 ]
+# Flat pin tables derived once from MOTORS, indexed by motor
+STEP_PINS = tuple(m['step'] for m in MOTORS)
+DIR_PINS = tuple(m['dir'] for m in MOTORS)
 STEPS_PER_REV = 400
 ANGLE_TO_MOVE = 45  # 45 degrees movement
+TX_POLL_S = 0.05  # how often to check on a running tx_pwm train
+STATUS_INTERVAL_S = 0.25  # minimum gap between progress messages from one motor
+# Below this much remaining time we spin instead of sleeping; sleeps stop this
+# far short of the deadline so that wake-up latency is absorbed by the spin.
+SPIN_THRESHOLD_NS = 200_000
+SPIN_MARGIN_NS = 150_000
+
+# Motor threads ask for SCHED_FIFO at this priority; needs root or CAP_SYS_NICE
+# (e.g. sudo setcap cap_sys_nice+ep "$(readlink -f "$(which python3)")")
+RT_PRIORITY = 50
+RT_WARNED = False
+
+def promote_realtime(status_callback):
+    """Move the calling thread to SCHED_FIFO, warning (once) if it isn't allowed."""
+    global RT_WARNED
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+    except (AttributeError, OSError) as e:
+        if RT_WARNED:
+            return
+        RT_WARNED = True
+        status_callback(f"⚠️ Real-time scheduling unavailable ({e}); step timing is best-effort")
+
+# Steps for every whole-degree target the angle spinbox allows, indexed by angle
+STEPS_FOR_ANGLE = tuple(int(STEPS_PER_REV * a / 360) for a in range(181))
+
+@lru_cache(maxsize=512)
+def half_period(rpm):
+    """Seconds between step edges (half a step period) at the given speed."""
+    return 30.0 / (STEPS_PER_REV * rpm)
+
+# time.monotonic_ns() reads CLOCK_MONOTONIC on Linux, so its deadlines can be
+# handed straight to clock_nanosleep(TIMER_ABSTIME) without relative-sleep drift.
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+try:
+    _clock_nanosleep = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).clock_nanosleep
+except (OSError, AttributeError, TypeError):
+    _clock_nanosleep = None
+
+def sleep_until(deadline_ns):
+    """Sleep until the absolute CLOCK_MONOTONIC time deadline_ns."""
+    if _clock_nanosleep is None:
+        time.sleep(max(0, deadline_ns - time.monotonic_ns()) / 1e9)
+        return
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+
+def wait_until(deadline_ns):
+    """Block until time.monotonic_ns() reaches deadline_ns (hybrid sleep + spin)."""
+    if deadline_ns - time.monotonic_ns() > SPIN_THRESHOLD_NS:
+        sleep_until(deadline_ns - SPIN_MARGIN_NS)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+
+def tx_steps(handle, step_pin, steps, step_hz, stop_event=None, report=None):
+    """Clock `steps` 50% duty step pulses at step_hz out of lgpio's tx engine and wait for them.
+
+    Returns the number of steps sent (estimated from elapsed time if
+    stop_event gets set), or None if tx_pwm is unavailable so the
+    caller can fall back to toggling the pin itself. report(steps_done)
+    is called about every STATUS_INTERVAL_S while the train runs.
+    """
+    try:
+        lgpio.tx_pwm(handle, step_pin, step_hz, 50.0, 0, steps)
+    except lgpio.error:
+        return None
+    started = last_report = time.monotonic()
+    while lgpio.tx_busy(handle, step_pin, lgpio.TX_PWM):
+        if stop_event is None:
+            time.sleep(TX_POLL_S)
+        elif stop_event.wait(TX_POLL_S):
+            lgpio.tx_pwm(handle, step_pin, 0, 0)
+            return min(steps, int((time.monotonic() - started) * step_hz))
+        now = time.monotonic()
+        if report is not None and now - last_report > STATUS_INTERVAL_S:
+            last_report = now
+            report(min(steps, int((now - started) * step_hz)))
+    return steps
+
+def simulate_steps(steps, half_period_s, stop_event=None, report=None):
+    """Stand-in for a step train off the Pi: waits out the move's duration in
+    STATUS_INTERVAL_S slices instead of looping per step.
+
+    Returns the number of steps that would have been sent, calling
+    report(steps_done) after each slice.
+    """
+    started = time.monotonic()
+    duration = steps * 2 * half_period_s
+    while True:
+        elapsed = time.monotonic() - started
+        done = min(steps, int(elapsed / (2 * half_period_s)))
+        if done >= steps:
+            return done
+        if report is not None and done:
+            report(done)
+        slice_s = min(STATUS_INTERVAL_S, duration - elapsed)
+        if stop_event is None:
+            time.sleep(slice_s)
+        elif stop_event.wait(slice_s):
+            return min(steps, int((time.monotonic() - started) / (2 * half_period_s)))
+
+@dataclass(frozen=True, slots=True)
+class SequenceConfig:
+    """Widget values snapshotted on the GUI thread at Start; workers only read this."""
+    speeds: tuple
+    delays: tuple
+    angles: tuple
+    starts: tuple
+    reps: int
+    return_together: bool
 
 class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position, gpio_handle, target_angle=45):
+    def __init__(self, step_pin, dir_pin, speed_rpm, stop_event, steps_moved, idx, status_callback, direction, start_position, gpio_handle, target_angle=45, start_delay=0.0):
         super().__init__()
         self.step_pin = step_pin
         self.dir_pin = dir_pin
         self.speed_rpm = speed_rpm
-        self.running_event = running_event
+        self.stop_event = stop_event
         self.steps_moved = steps_moved
         self.idx = idx
         self.status_callback = status_callback
@@ -56,37 +180,62 @@ class MotorThread(threading.Thread):
         self.start_position = start_position
         self.gpio_handle = gpio_handle
         self.target_angle = target_angle
-        self.steps_to_target = int(STEPS_PER_REV * target_angle / 360)
+        self.steps_to_target = STEPS_FOR_ANGLE[target_angle]
+        self.start_delay = start_delay
 
     def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
+        # Staggered start; Stop during the delay means this motor never moves
+        if self.start_delay > 0 and self.stop_event.wait(self.start_delay):
+            return
+        self.status_callback(
+            f"Motor {self.idx+1}: started at speed {self.speed_rpm} RPM after {self.start_delay:.1f}s delay. [Start: {self.start_position}, Angle: {self.target_angle}°]"
+        )
+        if ON_PI:
+            promote_realtime(self.status_callback)
+        step_delay = half_period(self.speed_rpm)
         if ON_PI:
             lgpio.gpio_write(self.gpio_handle, self.dir_pin, 1 if self.direction else 0)
         
         # Move to target position
         steps_moved_to_target = 0
-        while steps_moved_to_target < self.steps_to_target and self.running_event.is_set():
-            if ON_PI:
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 1)
-                time.sleep(step_delay)
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 0)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            steps_moved_to_target += 1
-            self.steps_moved[self.idx] += 1
+        if ON_PI:
+            sent = tx_steps(self.gpio_handle, self.step_pin, self.steps_to_target,
+                            0.5 / step_delay, self.stop_event)
+        else:
+            sent = simulate_steps(self.steps_to_target, step_delay, self.stop_event,
+                                  lambda done: self.status_callback(f"Motor {self.idx+1}: Moving to target position... ({done}/{self.steps_to_target})"))
+        if sent is not None:
+            steps_moved_to_target = sent
+            self.steps_moved[self.idx] += sent
+        else:
+            # lgpio without tx_pwm: toggle the pin ourselves
+            gpio_write, handle, step_pin = lgpio.gpio_write, self.gpio_handle, self.step_pin
+            stopped, monotonic = self.stop_event.is_set, time.monotonic
+            target = self.steps_to_target
+            period_ns = int(step_delay * 1e9)
+            deadline = time.monotonic_ns()
+            last_emit = monotonic()
+            while steps_moved_to_target < target and not stopped():
+                gpio_write(handle, step_pin, 1)
+                deadline += period_ns
+                wait_until(deadline)
+                gpio_write(handle, step_pin, 0)
+                deadline += period_ns
+                wait_until(deadline)
+                steps_moved_to_target += 1
             
-            if steps_moved_to_target % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1}: Moving to target position... ({steps_moved_to_target}/{self.steps_to_target})")
-                print(f"Motor {self.idx+1}: Moving to target position... ({steps_moved_to_target}/{self.steps_to_target})")
+                now = monotonic()
+                if now - last_emit > STATUS_INTERVAL_S:
+                    last_emit = now
+                    self.status_callback(f"Motor {self.idx+1}: Moving to target position... ({steps_moved_to_target}/{target})")
+            self.steps_moved[self.idx] += steps_moved_to_target
         
         if steps_moved_to_target >= self.steps_to_target:
             self.status_callback(f"Motor {self.idx+1}: Reached target position! Waiting 3 seconds...")
-            print(f"Motor {self.idx+1}: Reached target position! Waiting 3 seconds...")
-            time.sleep(3)  # Wait 3 seconds at target position
+            self.stop_event.wait(3)  # Wait 3 seconds at target position, unless stopped
 
 class ReturnThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, steps_to_return, idx, status_callback, direction, start_position, gpio_handle, return_speed_factor=0.5):
+    def __init__(self, step_pin, dir_pin, speed_rpm, steps_to_return, idx, status_callback, direction, start_position, gpio_handle, return_speed_factor=0.5, stop_event=None):
         super().__init__()
         self.step_pin = step_pin
         self.dir_pin = dir_pin
@@ -98,35 +247,53 @@ class ReturnThread(threading.Thread):
         self.daemon = True
         self.start_position = start_position
         self.gpio_handle = gpio_handle
+        self.stop_event = stop_event
 
     def run(self):
         if self.steps_to_return == 0:
             self.status_callback(f"Motor {self.idx+1}: Already at start position.")
-            print(f"Motor {self.idx+1}: Already at start position.")
             return
             
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
+        if ON_PI:
+            promote_realtime(self.status_callback)
+        step_delay = half_period(self.speed_rpm)
         if ON_PI:
             lgpio.gpio_write(self.gpio_handle, self.dir_pin, 1 if self.direction else 0)
         
         self.status_callback(f"Motor {self.idx+1}: Returning {self.steps_to_return} steps to {self.start_position} position...")
-        print(f"Motor {self.idx+1}: Returning {self.steps_to_return} steps to {self.start_position} position...")
         
-        for step in range(self.steps_to_return):
-            if ON_PI:
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 1)
-                time.sleep(step_delay)
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 0)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
+        report = lambda done: self.status_callback(f"Motor {self.idx+1}: Returning... ({done}/{self.steps_to_return})")
+        if ON_PI:
+            sent = tx_steps(self.gpio_handle, self.step_pin, self.steps_to_return,
+                            0.5 / step_delay, self.stop_event, report)
+        else:
+            sent = simulate_steps(self.steps_to_return, step_delay, self.stop_event, report)
+        if sent is None:
+            # lgpio without tx_pwm: toggle the pin ourselves
+            gpio_write, handle, step_pin = lgpio.gpio_write, self.gpio_handle, self.step_pin
+            monotonic = time.monotonic
+            period_ns = int(step_delay * 1e9)
+            deadline = time.monotonic_ns()
+            last_emit = monotonic()
+            for step in range(self.steps_to_return):
+                if self.stop_event is not None and self.stop_event.is_set():
+                    break
+                gpio_write(handle, step_pin, 1)
+                deadline += period_ns
+                wait_until(deadline)
+                gpio_write(handle, step_pin, 0)
+                deadline += period_ns
+                wait_until(deadline)
             
-            if step % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1}: Returning... ({step}/{self.steps_to_return})")
-                print(f"Motor {self.idx+1}: Returning... ({step}/{self.steps_to_return})")
+                now = monotonic()
+                if now - last_emit > STATUS_INTERVAL_S:
+                    last_emit = now
+                    self.status_callback(f"Motor {self.idx+1}: Returning... ({step + 1}/{self.steps_to_return})")
 
-        self.status_callback(f"Motor {self.idx+1}: Returned to start position.")
-        print(f"Motor {self.idx+1}: Returned to start position.")
+        if self.stop_event is not None and self.stop_event.is_set():
+            self.status_callback(f"Motor {self.idx+1}: Return stopped before reaching start position.")
+        else:
+            self.status_callback(f"Motor {self.idx+1}: Returned to start position.")
 
 class MotorControlApp(QMainWindow):
     finished = pyqtSignal()
@@ -145,14 +312,16 @@ class MotorControlApp(QMainWindow):
         self.tabs.addTab(self.config_tab, "Motor Control")
         self.tabs.addTab(self.status_tab, "Status Log")
 
+        self._status_shown = False
         self._init_config_tab()
         self._init_status_tab()
         self.finished.connect(self.show_finished)
         self.motor_status.connect(self.append_status)
         self.sequence_complete.connect(self.on_sequence_complete)
 
-        self.steps_moved = [0, 0, 0]
-        self.running_events = [threading.Event() for _ in range(3)]
+        self.steps_moved = array('i', [0] * len(MOTORS))
+        # Set by Stop/Close; waits on it wake immediately instead of sleeping out
+        self.stop_event = threading.Event()
         self.threads = [None, None, None]
         self.return_threads = []
         self.start_positions = ['A', 'A', 'A']  # default
@@ -160,14 +329,19 @@ class MotorControlApp(QMainWindow):
         self.current_rep = 0
         self.total_reps = 1
         self.is_running_sequence = False
+        # Waiters share a couple of long-lived workers instead of a fresh thread each
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        if ON_PI:
+            self._open_gpio()
 
     def emit_motor_status_safe(self, message: str):
-        """Emit motor_status on the GUI thread."""
-        QTimer.singleShot(0, lambda: self.motor_status.emit(message))
+        """Emit motor_status from any thread; Qt queues it to the GUI thread."""
+        self.motor_status.emit(message)
 
     def emit_sequence_complete_safe(self):
-        """Emit sequence_complete on the GUI thread."""
-        QTimer.singleShot(0, lambda: self.sequence_complete.emit())
+        """Emit sequence_complete from any thread; Qt queues it to the GUI thread."""
+        self.sequence_complete.emit()
 
     def _init_config_tab(self):
         vbox = QVBoxLayout()
@@ -271,8 +445,13 @@ class MotorControlApp(QMainWindow):
         vlayout = QVBoxLayout()
         self.status_text = QTextEdit()
         self.status_text.setReadOnly(True)
+        # Keep appends cheap on long runs by dropping the oldest lines
+        self.status_text.document().setMaximumBlockCount(500)
         vlayout.addWidget(QLabel("Live Status:"))
         vlayout.addWidget(self.status_text)
+
+        self.auto_switch_cb = QCheckBox("Auto-switch to status")
+        vlayout.addWidget(self.auto_switch_cb)
         
         # Add close button to status tab as well
         close_status_btn = QPushButton("❌ Close Application")
@@ -284,7 +463,10 @@ class MotorControlApp(QMainWindow):
 
     def append_status(self, message):
         self.status_text.append(message)
-        self.tabs.setCurrentWidget(self.status_tab)
+        # Show the log once per run; after that only if the user asked for it
+        if not self._status_shown or self.auto_switch_cb.isChecked():
+            self._status_shown = True
+            self.tabs.setCurrentWidget(self.status_tab)
 
     def show_finished(self):
         self.append_status("✅ All sequences completed!")
@@ -299,7 +481,7 @@ class MotorControlApp(QMainWindow):
         if self.current_rep < self.total_reps:
             self.append_status(f"🔄 Sequence {self.current_rep} complete. Starting sequence {self.current_rep + 1}/{self.total_reps}...")
             # Wait 2-5 seconds before next sequence
-            wait_time = 2 if self.return_together_cb.isChecked() else 5
+            wait_time = 2 if self._cfg.return_together else 5
             self.append_status(f"⏳ Waiting {wait_time} seconds before next sequence...")
             QTimer.singleShot(int(wait_time * 1000), self.run_single_sequence)
         else:
@@ -308,36 +490,51 @@ class MotorControlApp(QMainWindow):
 
     def start_sequence(self):
         """Start the complete sequence with repetitions"""
-        self.total_reps = self.rep_spin.value()
+        self._cfg = SequenceConfig(
+            speeds=tuple(spin.value() for spin in self.speed_spins),
+            delays=tuple(spin.value() for spin in self.delay_spins),
+            angles=tuple(spin.value() for spin in self.angle_spins),
+            starts=tuple(cb.currentText() for cb in self.pos_combos),
+            reps=self.rep_spin.value(),
+            return_together=self.return_together_cb.isChecked(),
+        )
+        self.total_reps = self._cfg.reps
         self.current_rep = 0
         self.is_running_sequence = True
+        self._status_shown = False
         
         self.append_status(f"🚀 Starting sequence with {self.total_reps} repetition(s)...")
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         
-        # Initialize GPIO if on Raspberry Pi
-        if ON_PI:
-            try:
-                self.gpio_handle = lgpio.gpiochip_open(0)
-                if self.gpio_handle < 0:
-                    raise RuntimeError("Failed to open GPIO chip")
-                
-                for m in MOTORS:
-                    lgpio.gpio_claim_output(self.gpio_handle, 0, m['step'], 0)
-                    lgpio.gpio_claim_output(self.gpio_handle, 0, m['dir'], 0)
-                
-                self.append_status("✅ GPIO pins initialized successfully")
-            except Exception as e:
-                self.append_status(f"❌ GPIO Error: {e}")
-                QMessageBox.critical(self, "GPIO Error", f"Failed to initialize GPIO: {e}")
-                self.start_btn.setEnabled(True)
-                self.stop_btn.setEnabled(False)
-                return
+        # GPIO is claimed once at start-up; retry here if that failed
+        if ON_PI and self.gpio_handle is None and not self._open_gpio():
+            QMessageBox.critical(self, "GPIO Error", "Failed to initialize GPIO, see the status log for details.")
+            self.start_btn.setEnabled(True)
+            self.stop_btn.setEnabled(False)
+            return
 
         # Start the first sequence
         self.run_single_sequence()
 
+    def _open_gpio(self):
+        """Open the chip and claim every motor pin; the handle is kept until the app closes."""
+        handle = None
+        try:
+            handle = lgpio.gpiochip_open(0)
+            if handle < 0:
+                raise RuntimeError("Failed to open GPIO chip")
+            for pin in STEP_PINS + DIR_PINS:
+                lgpio.gpio_claim_output(handle, 0, pin, 0)
+        except Exception as e:
+            if handle is not None and handle >= 0:
+                lgpio.gpiochip_close(handle)
+            self.append_status(f"❌ GPIO Error: {e}")
+            return False
+        self.gpio_handle = handle
+        self.append_status("✅ GPIO pins initialized successfully")
+        return True
+
     def run_single_sequence(self):
         """Run a single sequence of motor movements"""
         if not self.is_running_sequence:
@@ -345,45 +542,31 @@ class MotorControlApp(QMainWindow):
             
         self.append_status(f"🔄 Running sequence {self.current_rep + 1}/{self.total_reps}")
         
-        self.start_positions = [cb.currentText() for cb in self.pos_combos]
-        self.steps_moved = [0, 0, 0]
-        speeds = [spin.value() for spin in self.speed_spins]
-        delays = [spin.value() for spin in self.delay_spins]
-        angles = [spin.value() for spin in self.angle_spins]
-        
-        # Clear any previous running events
-        for evt in self.running_events:
-            evt.clear()
-
-        # Start motors with delays
-        for idx, m in enumerate(MOTORS):
-            self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                time.sleep(delays[idx])
-                if not self.is_running_sequence:
-                    return
-                    
-                self.emit_motor_status_safe(
-                    f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.1f}s delay. [Start: {self.start_positions[idx]}, Angle: {angles[idx]}°]"
-                )
-                
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.emit_motor_status_safe,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx],
-                    gpio_handle=self.gpio_handle,
-                    target_angle=angles[idx]
-                )
-                self.threads[idx] = thread
-                thread.start()
-                
-            threading.Thread(target=run_motor).start()
+        cfg = self._cfg
+        self.start_positions = list(cfg.starts)
+        self.steps_moved = array('i', [0] * len(MOTORS))
+        speeds, delays, angles = cfg.speeds, cfg.delays, cfg.angles
+        
+        self.stop_event.clear()
+
+        # Start motors; each thread waits out its own start delay
+        for idx in range(len(MOTORS)):
+            thread = MotorThread(
+                step_pin=STEP_PINS[idx],
+                dir_pin=DIR_PINS[idx],
+                speed_rpm=speeds[idx],
+                stop_event=self.stop_event,
+                steps_moved=self.steps_moved,
+                idx=idx,
+                status_callback=self.emit_motor_status_safe,
+                direction=True if self.start_positions[idx] == 'A' else False,
+                start_position=self.start_positions[idx],
+                gpio_handle=self.gpio_handle,
+                target_angle=angles[idx],
+                start_delay=delays[idx]
+            )
+            self.threads[idx] = thread
+            thread.start()
 
         # Wait for all motors to reach target and complete 3-second wait
         def wait_and_return():
@@ -395,26 +578,26 @@ class MotorControlApp(QMainWindow):
             if not self.is_running_sequence:
                 return
                 
-            self.append_status("⏳ All motors reached target. Starting return sequence...")
+            self.emit_motor_status_safe("⏳ All motors reached target. Starting return sequence...")
             
-            if self.return_together_cb.isChecked():
+            if cfg.return_together:
                 # Return all motors together
                 self.return_all_motors_together(speeds)
             else:
                 # Return motors individually
                 self.return_motors_individually(speeds)
         
-        threading.Thread(target=wait_and_return, daemon=True).start()
+        self._executor.submit(wait_and_return)
 
     def return_all_motors_together(self, speeds):
         """Return all motors to start position together"""
         self.return_threads = []
         
-        for idx, m in enumerate(MOTORS):
+        for idx in range(len(MOTORS)):
             if self.steps_moved[idx] > 0:
                 rt = ReturnThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
+                    step_pin=STEP_PINS[idx],
+                    dir_pin=DIR_PINS[idx],
                     speed_rpm=speeds[idx],
                     steps_to_return=self.steps_moved[idx],
                     idx=idx,
@@ -422,7 +605,8 @@ class MotorControlApp(QMainWindow):
                     direction=True if self.start_positions[idx] == 'A' else False,
                     start_position=self.start_positions[idx],
                     gpio_handle=self.gpio_handle,
-                    return_speed_factor=0.5
+                    return_speed_factor=0.5,
+                    stop_event=self.stop_event
                 )
                 self.return_threads.append(rt)
                 rt.start()
@@ -435,95 +619,81 @@ class MotorControlApp(QMainWindow):
             if self.is_running_sequence:
                 self.emit_sequence_complete_safe()
         
-        threading.Thread(target=finish_return, daemon=True).start()
+        self._executor.submit(finish_return)
 
     def return_motors_individually(self, speeds):
         """Return motors to start position one by one"""
-        def return_individual(idx=0):
-            if idx >= len(MOTORS) or not self.is_running_sequence:
-                self.emit_sequence_complete_safe()
-                return
-                
-            if self.steps_moved[idx] > 0:
-                rt = ReturnThread(
-                    step_pin=MOTORS[idx]['step'],
-                    dir_pin=MOTORS[idx]['dir'],
-                    speed_rpm=speeds[idx],
-                    steps_to_return=self.steps_moved[idx],
-                    idx=idx,
-                    status_callback=self.emit_motor_status_safe,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx],
-                    gpio_handle=self.gpio_handle,
-                    return_speed_factor=0.5
-                )
-                rt.start()
-                rt.join()
-            
-            # Wait before next motor returns
-            if idx < len(MOTORS) - 1:
-                time.sleep(1)
-            
-            # Return next motor
-            return_individual(idx + 1)
-        
-        threading.Thread(target=return_individual, daemon=True).start()
+        def return_individual():
+            self.return_threads = []
+            for idx in range(len(MOTORS)):
+                if not self.is_running_sequence:
+                    break
+                if self.steps_moved[idx] > 0:
+                    rt = ReturnThread(
+                        step_pin=STEP_PINS[idx],
+                        dir_pin=DIR_PINS[idx],
+                        speed_rpm=speeds[idx],
+                        steps_to_return=self.steps_moved[idx],
+                        idx=idx,
+                        status_callback=self.emit_motor_status_safe,
+                        direction=True if self.start_positions[idx] == 'A' else False,
+                        start_position=self.start_positions[idx],
+                        gpio_handle=self.gpio_handle,
+                        return_speed_factor=0.5,
+                        stop_event=self.stop_event
+                    )
+                    self.return_threads.append(rt)
+                    rt.start()
+                    rt.join()
+
+                # Wait before next motor returns
+                if idx < len(MOTORS) - 1:
+                    time.sleep(1)
+
+            self.emit_sequence_complete_safe()
+
+        self._executor.submit(return_individual)
 
     def stop_motors(self):
         """Stop all motors and reset sequence"""
         self.append_status("🛑 Stop requested. Halting all motors...")
         self.is_running_sequence = False
         
-        # Stop all running events
-        for evt in self.running_events:
-            evt.clear()
-        
-        # Wait for threads to finish
-        for t in self.threads:
-            if t and t.is_alive():
-                t.join(timeout=2)
-        
-        for rt in self.return_threads:
-            if rt and rt.is_alive():
-                rt.join(timeout=2)
+        self.stop_event.set()
         
-        # Cleanup GPIO
-        if ON_PI and self.gpio_handle:
-            try:
-                lgpio.gpiochip_close(self.gpio_handle)
-            except:
-                pass
+        # Wait for threads to finish, all sharing one 2 s budget
+        self._join_all(2.0)
         
         self.append_status("🛑 All motors stopped.")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
 
+    def _join_all(self, timeout):
+        """Join motor and return threads against a single shared deadline."""
+        deadline = time.monotonic() + timeout
+        for t in list(self.threads) + list(self.return_threads):
+            if t and t.is_alive():
+                t.join(timeout=max(0, deadline - time.monotonic()))
+
     def close_application(self):
         """Close the application with proper cleanup"""
         self.is_running_sequence = False
         
         # Stop any running motors first
-        if hasattr(self, 'running_events'):
-            for event in self.running_events:
-                event.clear()
+        self.stop_event.set()
         
         # Wait for threads to finish
-        if hasattr(self, 'threads'):
-            for thread in self.threads:
-                if thread and thread.is_alive():
-                    thread.join(timeout=1)
-        
-        if hasattr(self, 'return_threads'):
-            for thread in self.return_threads:
-                if thread and thread.is_alive():
-                    thread.join(timeout=1)
+        self._join_all(1.0)
         
+        self._executor.shutdown(wait=False)
+
         # Cleanup GPIO if on Raspberry Pi
-        if ON_PI and self.gpio_handle:
+        if ON_PI and self.gpio_handle is not None:
             try:
                 lgpio.gpiochip_close(self.gpio_handle)
             except:
                 pass
+            self.gpio_handle = None
         
         # Close the application
         self.close()
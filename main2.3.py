@@ -1,7 +1,14 @@
+import ctypes
+import ctypes.util
+import heapq
 import sys
 import threading
 import time
 import os
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter_ns, sleep
 
 # Detect if running on Raspberry Pi
 try:
@@ -10,6 +17,11 @@ try:
 except ImportError:
     ON_PI = False
 
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
 # Set Qt environment variables for Raspberry Pi
 if ON_PI:
     os.environ['QT_QPA_PLATFORM'] = 'eglfs'  # Use EGLFS for Raspberry Pi
@@ -24,97 +36,340 @@ if ON_PI:
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget,
     QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QTextEdit,
+    QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QPlainTextEdit,
     QGroupBox, QMessageBox, QComboBox
 )
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, QTimer
+from PyQt5.QtGui import QTextCursor
 
 MOTORS = [
     {'step': 17, 'dir': 27},
     {'step': 22, 'dir': 23},
     {'step': 24, 'dir': 25}
 ]
+# Flat pin tables derived once from MOTORS, indexed by motor
+STEP_PINS = tuple(m['step'] for m in MOTORS)
+DIR_PINS = tuple(m['dir'] for m in MOTORS)
 STEPS_PER_REV = 200
+# Status lines from worker threads are buffered and flushed to the log at this rate
+STATUS_FLUSH_MS = 100
+STATUS_BUFFER_LINES = 2000
 
-class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position):
-        super().__init__()
-        self.step_pin = step_pin
-        self.dir_pin = dir_pin
-        self.speed_rpm = speed_rpm
-        self.running_event = running_event
+# perf_counter_ns() reads CLOCK_MONOTONIC on Linux, so its deadlines can be
+# handed straight to clock_nanosleep(TIMER_ABSTIME) without relative-sleep drift.
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+try:
+    _clock_nanosleep = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).clock_nanosleep
+except (OSError, AttributeError, TypeError):
+    _clock_nanosleep = None
+
+def sleep_until(deadline_ns):
+    """Sleep until the absolute CLOCK_MONOTONIC time deadline_ns."""
+    if _clock_nanosleep is None:
+        remaining = deadline_ns - perf_counter_ns()
+        if remaining > 0:
+            sleep(remaining / 1e9)
+        return
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+
+# Below this much remaining time we spin instead of sleeping; sleeps stop this
+# far short of the deadline so that wake-up latency is absorbed by the spin.
+SPIN_THRESHOLD_NS = 200_000
+SPIN_MARGIN_NS = 150_000
+# Only motors with half-periods shorter than this spin (above 75 RPM with a
+# 200-step motor); slower ones just sleep
+BUSY_WAIT_BELOW_NS = 2_000_000
+
+def wait_until(deadline_ns):
+    """Block until perf_counter_ns() reaches deadline_ns (hybrid sleep + spin)."""
+    if deadline_ns - perf_counter_ns() > SPIN_THRESHOLD_NS:
+        sleep_until(deadline_ns - SPIN_MARGIN_NS)
+    while perf_counter_ns() < deadline_ns:
+        pass
+
+# Waits longer than this (start delays, slow motors) block on the stop event
+# first, so Stop wakes the scheduler at once instead of after the sleep
+STOP_WAIT_ABOVE_NS = 20_000_000
+STOP_WAIT_MARGIN_NS = 2_000_000
+
+def wait_or_stop(deadline_ns, stop_event, wait_edge):
+    """wait_edge(deadline_ns), returning True early if stop_event gets set."""
+    remaining = deadline_ns - perf_counter_ns()
+    if remaining > STOP_WAIT_ABOVE_NS:
+        if stop_event.wait((remaining - STOP_WAIT_MARGIN_NS) / 1e9):
+            return True
+    wait_edge(deadline_ns)
+    return stop_event.is_set()
+
+# Stepping threads ask for SCHED_FIFO and the core isolated with isolcpus=3
+# (add it to /boot/cmdline.txt); needs root or CAP_SYS_NICE, else they run as usual
+RT_PRIORITY = 80
+RT_CPU = 3
+RT_WARNED = False
+
+def promote_realtime(status_callback):
+    """Move the calling thread to SCHED_FIFO on RT_CPU, warning (once) if it isn't allowed."""
+    global RT_WARNED
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+        if RT_CPU < os.cpu_count():
+            os.sched_setaffinity(0, {RT_CPU})
+    except (AttributeError, OSError) as e:
+        if RT_WARNED:
+            return
+        RT_WARNED = True
+        status_callback(f"⚠️ Real-time scheduling unavailable ({e}); step timing is best-effort")
+
+def gpio_output_sim(channels, levels):
+    pass
+
+# Pin writes resolved once at import; off the Pi they are no-ops, so the step
+# loops run the same code on both without testing ON_PI per edge
+gpio_output = GPIO.output if ON_PI else gpio_output_sim
+
+EDGE_START, EDGE_HIGH, EDGE_LOW = 0, 1, 2
+# Edges of different motors due within this many ns of each other share one GPIO write
+EDGE_SLACK_NS = 50_000
+
+class MotorScheduler:
+    """Steps every motor from one thread, always serving the earliest pending edge.
+
+    Each motor's start delay, step edges and 25-step direction bounce are
+    events on a single heap, so the three motors no longer compete for the
+    GIL from three threads. Edges that fall due together are written with
+    one GPIO.output call.
+    """
+    __slots__ = ('speeds', 'half_periods', 'delays', 'run_flags', 'steps_moved', 'status_callback',
+                 'start_positions', 'stop_event', 'dir_levels', '_use_busy')
+
+    def __init__(self, speeds, half_periods, delays, run_flags, steps_moved, status_callback, start_positions,
+                 stop_event):
+        self.speeds = speeds
+        self.delays = delays
+        self.run_flags = run_flags
         self.steps_moved = steps_moved
-        self.idx = idx
         self.status_callback = status_callback
-        self.direction = direction
-        self.daemon = True
-        self.start_position = start_position
+        self.start_positions = start_positions
+        self.stop_event = stop_event
+        # Static per-motor values worked out once here, not in run()
+        self.half_periods = half_periods
+        self.dir_levels = [1 if pos == 'A' else 0 for pos in start_positions]
+        self._use_busy = min(self.half_periods) < BUSY_WAIT_BELOW_NS
 
     def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
         if ON_PI:
-            GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-        while self.running_event.is_set():
-            if ON_PI:
-                GPIO.output(self.step_pin, GPIO.HIGH)
-                time.sleep(step_delay)
-                GPIO.output(self.step_pin, GPIO.LOW)
-                time.sleep(step_delay)
+            promote_realtime(self.status_callback)
+        half_periods = self.half_periods
+        dir_levels = list(self.dir_levels)
+        start = perf_counter_ns()
+        heap = [(start + int(delay * 1e9), idx, EDGE_START) for idx, delay in enumerate(self.delays)]
+        heapq.heapify(heap)
+
+        # Hot-loop names bound once; the heap is serviced per edge
+        push, pop, output = heapq.heappush, heapq.heappop, gpio_output
+        run_flags = self.run_flags
+        steps_moved, status_callback = self.steps_moved, self.status_callback
+        start_positions = self.start_positions
+        wait_edge = wait_until if self._use_busy else sleep_until
+        stop_event = self.stop_event
+        # Steps left before each motor's next bounce, and bounces so far; the step
+        # count is only rebuilt from these when the run ends
+        countdown = [25] * len(half_periods)
+        bounces = [0] * len(half_periods)
+        # Every dir pin is set once up front; after that it only changes on a bounce
+        output(DIR_PINS, dir_levels)
+        try:
+            while heap and any(run_flags):
+                deadline = heap[0][0]
+                if wait_or_stop(deadline, stop_event, wait_edge):
+                    break
+                rising, falling, falling_levels, messages = [], [], [], []
+                while heap and heap[0][0] <= deadline + EDGE_SLACK_NS:
+                    t, idx, edge = pop(heap)
+                    if not run_flags[idx]:
+                        continue
+                    if edge == EDGE_START:
+                        status_callback(
+                            f"Motor {idx+1}: started at speed {self.speeds[idx]} RPM after {self.delays[idx]:.2f}s delay. [Start: {self.start_positions[idx]}]"
+                        )
+                        push(heap, (t, idx, EDGE_HIGH))
+                    elif edge == EDGE_HIGH:
+                        rising.append(STEP_PINS[idx])
+                        push(heap, (t + half_periods[idx], idx, EDGE_LOW))
+                    else:
+                        # Levels are plain 0/1, which GPIO.output takes as LOW/HIGH
+                        falling.append(STEP_PINS[idx])
+                        falling_levels.append(0)
+                        countdown[idx] -= 1
+                        if not countdown[idx]:
+                            # Bounce: the direction flip rides on the call that ends the
+                            # step pulse, and every other bounce is back at the start
+                            countdown[idx] = 25
+                            bounces[idx] += 1
+                            dir_levels[idx] ^= 1
+                            falling.append(DIR_PINS[idx])
+                            falling_levels.append(dir_levels[idx])
+                            if bounces[idx] & 1:
+                                messages.append(f"Motor {idx+1} moved: C")
+                            else:
+                                messages.append(f"Motor {idx+1} moved: {start_positions[idx]}")
+                        push(heap, (t + half_periods[idx], idx, EDGE_HIGH))
+                if rising:
+                    output(rising, 1)
+                if falling:
+                    output(falling, falling_levels)
+                for message in messages:
+                    status_callback(message)
+        finally:
+            for idx in range(len(half_periods)):
+                steps_moved[idx] = 25 * bounces[idx] + 25 - countdown[idx]
+
+# pigpio waves are clocked out by DMA, so a return move needs no Python per edge;
+# only used when the pigpiod daemon is running.
+WAVE_POLL_S = 0.01
+PIGPIO = None
+
+def connect_pigpio():
+    """Connect to the pigpio daemon, or return None if it isn't installed/running."""
+    if pigpio is None:
+        return None
+    pi = pigpio.pi()
+    if not pi.connected:
+        return None
+    return pi
+
+def return_wave_train(idx, step_pin, dir_pin, steps_moved, direction, start_position, step_delay_ns):
+    """pigpio pulses for the same bounce ReturnMove would step, plus its status lines.
+
+    The train opens by setting dir_pin from direction, as ReturnMove does,
+    rather than inheriting whatever level the forward move left on it.
+    Direction flips ride on the pulse that ends a step, as in the software loops.
+    """
+    step_mask, dir_mask = 1 << step_pin, 1 << dir_pin
+    half_us = max(1, step_delay_ns // 1000)
+    # Half a period of dir setup time before the first step
+    if direction:
+        pulses = [pigpio.pulse(dir_mask, 0, half_us)]
+    else:
+        pulses = [pigpio.pulse(0, dir_mask, half_us)]
+    messages = []
+    s = steps_moved
+    while True:
+        pulses.append(pigpio.pulse(step_mask, 0, half_us))
+        s += 1
+        if s % 25 == 0:
+            direction = not direction
+            if direction:
+                pulses.append(pigpio.pulse(dir_mask, step_mask, half_us))
             else:
-                time.sleep(step_delay * 2)
-            self.steps_moved[self.idx] += 1
-            if self.steps_moved[self.idx] % 25 == 0:
-                self.direction = False if self.direction == True else True
-                if ON_PI:
-                    GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-            if self.steps_moved[self.idx] % 50 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: {self.start_position}")
-            elif self.steps_moved[self.idx] % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: C")
-
-class ReturnThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, steps_to_return, idx, status_callback, direction, start_position):
-        super().__init__()
+                pulses.append(pigpio.pulse(0, step_mask | dir_mask, half_us))
+        else:
+            pulses.append(pigpio.pulse(0, step_mask, half_us))
+        if s % 50 == 0:
+            messages.append(f"Motor {idx+1} moved: {start_position}")
+            break
+        elif s % 25 == 0:
+            messages.append(f"Motor {idx+1} moved: C")
+    messages.append(f"Motor {idx+1} returned to start position.")
+    return pulses, messages
+
+def send_wave(trains):
+    """Merge the pulse trains into one wave, send it and block until it is done."""
+    PIGPIO.wave_clear()
+    for pulses in trains:
+        PIGPIO.wave_add_generic(pulses)
+    wid = PIGPIO.wave_create()
+    PIGPIO.wave_send_once(wid)
+    try:
+        while PIGPIO.wave_tx_busy():
+            time.sleep(WAVE_POLL_S)
+    finally:
+        PIGPIO.wave_delete(wid)
+
+class ReturnMove:
+    """One motor's bounce back to its start position, worked out once up front.
+
+    Keeps the half period, the starting dir level, the steps until the first
+    25-step flip and how many flips it takes to reach the next multiple of 50.
+    """
+    __slots__ = ('step_pin', 'dir_pin', 'half_period_ns', 'steps_to_return', 'idx', 'direction',
+                 'start_position', '_dir0', '_steps_to_flip', '_flips', '_use_busy')
+
+    def __init__(self, step_pin, dir_pin, half_period_ns, steps_to_return, idx, direction, start_position):
         self.step_pin = step_pin
         self.dir_pin = dir_pin
-        self.speed_rpm = speed_rpm
+        self.half_period_ns = half_period_ns
         self.steps_to_return = steps_to_return
         self.idx = idx
-        self.status_callback = status_callback
         self.direction = direction
-        self.daemon = True
         self.start_position = start_position
-
-    def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
-        if ON_PI:
-            GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-        s = self.steps_to_return
-        while True:
-            if ON_PI:
-                GPIO.output(self.step_pin, GPIO.HIGH)
-                time.sleep(step_delay)
-                GPIO.output(self.step_pin, GPIO.LOW)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            s += 1
-            if s % 25 == 0:
-                self.direction = False if self.direction == True else True
-                if ON_PI:
-                    GPIO.output(self.dir_pin, GPIO.HIGH if self.direction else GPIO.LOW)
-
-            if s % 50 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: {self.start_position}")
-                break
-            elif s % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1} moved: C")
-
-        self.status_callback(f"Motor {self.idx+1} returned to start position.")
+        self._dir0 = 1 if direction else 0
+        self._steps_to_flip = 25 - steps_to_return % 25
+        self._flips = 2 if steps_to_return % 50 < 25 else 1
+        self._use_busy = self.half_period_ns < BUSY_WAIT_BELOW_NS
+
+def return_motors_scheduled(moves, status_callback):
+    """Step every ReturnMove from one thread, always serving the earliest pending edge.
+
+    The return counterpart of MotorScheduler: edges of different motors that
+    fall due together go out in one GPIO.output call, and each motor drops off
+    the heap once its last flip puts it back at the start.
+    """
+    if ON_PI:
+        promote_realtime(status_callback)
+    # Hot-loop names bound once; the heap is serviced per edge
+    push, pop, output = heapq.heappush, heapq.heappop, gpio_output
+    wait_edge = wait_until if any(mv._use_busy for mv in moves) else sleep_until
+    dir_levels = [mv._dir0 for mv in moves]
+    countdown = [mv._steps_to_flip for mv in moves]
+    flips_left = [mv._flips for mv in moves]
+    output([mv.dir_pin for mv in moves], dir_levels)
+
+    start = perf_counter_ns()
+    heap = [(start, i, EDGE_HIGH) for i in range(len(moves))]
+    heapq.heapify(heap)
+    while heap:
+        deadline = heap[0][0]
+        wait_edge(deadline)
+        rising, falling, falling_levels, messages = [], [], [], []
+        while heap and heap[0][0] <= deadline + EDGE_SLACK_NS:
+            t, i, edge = pop(heap)
+            mv = moves[i]
+            if edge == EDGE_HIGH:
+                rising.append(mv.step_pin)
+                push(heap, (t + mv.half_period_ns, i, EDGE_LOW))
+                continue
+            falling.append(mv.step_pin)
+            falling_levels.append(0)
+            countdown[i] -= 1
+            if not countdown[i]:
+                # Direction flips ride on the call that ends the step pulse
+                countdown[i] = 25
+                dir_levels[i] ^= 1
+                falling.append(mv.dir_pin)
+                falling_levels.append(dir_levels[i])
+                flips_left[i] -= 1
+                if not flips_left[i]:
+                    messages.append(f"Motor {mv.idx+1} moved: {mv.start_position}")
+                    messages.append(f"Motor {mv.idx+1} returned to start position.")
+                    continue
+                messages.append(f"Motor {mv.idx+1} moved: C")
+            push(heap, (t + mv.half_period_ns, i, EDGE_HIGH))
+        if rising:
+            output(rising, 1)
+        if falling:
+            output(falling, falling_levels)
+        for message in messages:
+            status_callback(message)
 
 class MotorControlApp(QMainWindow):
     finished = pyqtSignal()
-    motor_status = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
@@ -131,12 +386,22 @@ class MotorControlApp(QMainWindow):
         self._init_config_tab()
         self._init_status_tab()
         self.finished.connect(self.show_finished)
-        self.motor_status.connect(self.append_status)
+
+        # Worker threads queue status lines here; the GUI thread flushes them in batches
+        self._status_buf = deque(maxlen=STATUS_BUFFER_LINES)
+        self.queue_status = self._status_buf.append
+        self._flush_timer = QTimer(self)
+        self._flush_timer.timeout.connect(self._drain_status)
+        self._flush_timer.start(STATUS_FLUSH_MS)
 
         self.steps_moved = [0, 0, 0]
-        self.running_events = [threading.Event() for _ in range(3)]
-        self.threads = [None, None, None]
-        self.return_threads = []
+        # One byte per motor; the scheduler polls these without taking a lock
+        self._run_flags = array('B', [0] * len(MOTORS))
+        # Set by Stop/close; wakes the scheduler out of any long wait straight away
+        self._stop_event = threading.Event()
+        # The scheduler and the return/finish worker run on one long-lived pool
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="motor")
+        self.scheduler = None
         self.start_positions = ['A', 'A', 'A']  # default
 
     def _init_config_tab(self):
@@ -186,8 +451,11 @@ class MotorControlApp(QMainWindow):
 
     def _init_status_tab(self):
         vlayout = QVBoxLayout()
-        self.status_text = QTextEdit()
+        # Plain text skips rich-text layout, and the block cap keeps appends O(1)
+        self.status_text = QPlainTextEdit()
         self.status_text.setReadOnly(True)
+        self.status_text.setMaximumBlockCount(500)
+        self.status_text.setUndoRedoEnabled(False)
         vlayout.addWidget(QLabel("Live Status:"))
         vlayout.addWidget(self.status_text)
         self.stop_btn = QPushButton("🛑 Stop + Return")
@@ -198,10 +466,25 @@ class MotorControlApp(QMainWindow):
         self.status_tab.setLayout(vlayout)
 
     def append_status(self, message):
-        self.status_text.append(message)
+        """Append to the log with its signals held, then repaint and scroll once."""
+        status_text = self.status_text
+        status_text.blockSignals(True)
+        status_text.appendPlainText(message)
+        status_text.moveCursor(QTextCursor.End)
+        status_text.blockSignals(False)
+        status_text.viewport().update()
         self.tabs.setCurrentWidget(self.status_tab)
 
+    def _drain_status(self):
+        lines = []
+        while self._status_buf:
+            lines.append(self._status_buf.popleft())
+        if lines:
+            self.append_status("\n".join(lines))
+
     def show_finished(self):
+        # Flush what the return threads queued so the summary comes last
+        self._drain_status()
         self.append_status("✅ All motors returned to their start positions.")
         QMessageBox.information(self, "Done", "All motors returned to their start positions.")
         self.start_btn.setEnabled(True)
@@ -214,7 +497,10 @@ class MotorControlApp(QMainWindow):
             ", ".join([f"Motor {i+1}: {pos}" for i, pos in enumerate(self.start_positions)])
         )
         self.steps_moved = [0, 0, 0]
+        # Read the widgets once per Start; Stop + Return reuses these even if
+        # the spinboxes were edited while the motors ran
         speeds = [spin.value() for spin in self.speed_spins]
+        self._active_half = [int(60e9 / (STEPS_PER_REV * rpm) / 2) for rpm in speeds]
         delays = [spin.value() for spin in self.delay_spins]
         
         if ON_PI:
@@ -226,15 +512,17 @@ class MotorControlApp(QMainWindow):
                 # Set GPIO warnings to False to avoid warnings
                 GPIO.setwarnings(False)
                 
-                # Setup GPIO pins
-                for m in MOTORS:
-                    GPIO.setup(m['step'], GPIO.OUT)
-                    GPIO.setup(m['dir'], GPIO.OUT)
-                    # Initialize pins to LOW
-                    GPIO.output(m['step'], GPIO.LOW)
-                    GPIO.output(m['dir'], GPIO.LOW)
+                # Setup all step and dir pins as LOW outputs in one call
+                GPIO.setup([m['step'] for m in MOTORS] + [m['dir'] for m in MOTORS],
+                           GPIO.OUT, initial=GPIO.LOW)
                 
                 self.append_status("✅ GPIO pins initialized successfully")
+
+                global PIGPIO
+                if PIGPIO is None:
+                    PIGPIO = connect_pigpio()
+                    if PIGPIO is not None:
+                        self.append_status("⚡ pigpio daemon found, return moves are DMA-timed")
             except RuntimeError as e:
                 self.append_status(f"❌ GPIO Error: {e}")
                 self.append_status("💡 Try running with sudo or check if GPIO pins are in use")
@@ -247,74 +535,84 @@ class MotorControlApp(QMainWindow):
                 QMessageBox.critical(self, "GPIO Error", f"Unexpected GPIO error: {e}")
                 return
 
-        for evt in self.running_events:
-            evt.clear()
-        self.return_threads = []
-
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
-        for idx, m in enumerate(MOTORS):
-            self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                time.sleep(delays[idx])
-                self.motor_status.emit(
-                    f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.2f}s delay. [Start: {self.start_positions[idx]}]"
-                )
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.motor_status.emit,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx]
-                )
-                self.threads[idx] = thread
-                thread.start()
-            threading.Thread(target=run_motor).start()
+        self._stop_event.clear()
+        self._run_flags[:] = array('B', [1] * len(MOTORS))
+        self.scheduler = self._pool.submit(MotorScheduler(
+            speeds=speeds,
+            half_periods=self._active_half,
+            delays=delays,
+            run_flags=self._run_flags,
+            steps_moved=self.steps_moved,
+            status_callback=self.queue_status,
+            start_positions=self.start_positions,
+            stop_event=self._stop_event
+        ).run)
 
     def stop_motors(self):
         self.append_status("🛑 Stop pressed: halting and returning all motors to start position...")
         self.stop_btn.setEnabled(False)
 
-        for evt in self.running_events:
-            evt.clear()
-        for t in self.threads:
-            if t is not None:
-                t.join(timeout=2)
-
-        speeds = [spin.value() for spin in self.speed_spins]
-        for idx, m in enumerate(MOTORS):
-            steps_back = self.steps_moved[idx]
-            if steps_back == 0:
-                self.motor_status.emit(f"Motor {idx+1} already at {self.start_positions[idx]} position.")
-                continue
-            self.motor_status.emit(
-                f"Motor {idx+1} returning {steps_back} steps to {self.start_positions[idx]} position."
-            )
-            rt = ReturnThread(
-                step_pin=m['step'],
-                dir_pin=m['dir'],
-                speed_rpm=speeds[idx],
-                steps_to_return=steps_back,
-                idx=idx,
-                status_callback=self.motor_status.emit,
-                direction=True if self.start_positions[idx] == 'A' else False,
-                start_position=self.start_positions[idx]
-            )
-            self.return_threads.append(rt)
-            rt.start()
-
-        def finish_notice():
-            for rt in self.return_threads:
-                rt.join()
+        self._stop_event.set()
+        self._run_flags[:] = array('B', [0] * len(MOTORS))
+        scheduler = self.scheduler
+        start_positions = list(self.start_positions)
+        active_half = self._active_half
+
+        # The scheduler is joined on the pool's second worker, not here, so the
+        # GUI thread never blocks; that worker then steps every return and reports
+        def return_and_finish():
+            if scheduler is not None:
+                wait([scheduler], timeout=2)
+
+            trains, wave_messages, moves = [], [], []
+            for idx, m in enumerate(MOTORS):
+                steps_back = self.steps_moved[idx]
+                if steps_back == 0:
+                    self.queue_status(f"Motor {idx+1} already at {start_positions[idx]} position.")
+                    continue
+                self.queue_status(
+                    f"Motor {idx+1} returning {steps_back} steps to {start_positions[idx]} position."
+                )
+                if ON_PI and PIGPIO is not None:
+                    # pigpio plays one wave at a time, so every motor's return goes into the same one
+                    pulses, messages = return_wave_train(
+                        idx, m['step'], m['dir'], steps_back,
+                        start_positions[idx] == 'A', start_positions[idx],
+                        active_half[idx]
+                    )
+                    trains.append(pulses)
+                    wave_messages += messages
+                    continue
+                moves.append(ReturnMove(
+                    step_pin=m['step'],
+                    dir_pin=m['dir'],
+                    half_period_ns=active_half[idx],
+                    steps_to_return=steps_back,
+                    idx=idx,
+                    direction=start_positions[idx] == 'A',
+                    start_position=start_positions[idx]
+                ))
+
+            if trains:
+                send_wave(trains)
+                for message in wave_messages:
+                    self.queue_status(message)
+            if moves:
+                return_motors_scheduled(moves, self.queue_status)
             if ON_PI:
                 GPIO.cleanup()
             self.finished.emit()
-        threading.Thread(target=finish_notice, daemon=True).start()
+        self._pool.submit(return_and_finish)
+
+    def closeEvent(self, event):
+        """Stop the scheduler so the pool's (non-daemon) workers can wind down on exit."""
+        self._stop_event.set()
+        self._run_flags[:] = array('B', [0] * len(MOTORS))
+        self._pool.shutdown(wait=False)
+        event.accept()
 
 if __name__ == "__main__":
     # Try different Qt platforms for Raspberry Pi
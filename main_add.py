@@ -1,13 +1,18 @@
+import atexit
+import ctypes
+import ctypes.util
 import sys
 import threading
 import time
 import os
+from array import array
+from collections import deque
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QTabWidget,
     QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QTextEdit, QGroupBox, QMessageBox, QComboBox
+    QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QPlainTextEdit, QGroupBox, QMessageBox, QComboBox
 )
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, Qt, QTimer
 
 try:
     import lgpio
@@ -26,9 +31,16 @@ MOTORS = [
     {'step': 24, 'dir': 25, 'start_pos': 'B'}
 ]
 STEPS_PER_REV = 400  # Adjust for your hardware if needed
+STATUS_FLUSH_MS = 100  # how often status lines from the motor threads reach the log
 
 GPIO_HANDLE = None
 
+def motor_plan(speed_rpm, angle_degrees):
+    """(steps per move, half step period in integer ns) for one motor's settings."""
+    steps_to_move = max(1, int(STEPS_PER_REV * (angle_degrees / 360.0)))
+    half_delay_ns = int(60e9 / (STEPS_PER_REV * speed_rpm) / 2)
+    return steps_to_move, half_delay_ns
+
 def init_gpio_pins():
     """Initialize lgpio chip and claim motor pins as outputs with LOW default."""
     if not ON_PI:
@@ -64,20 +76,100 @@ def cleanup_gpio():
         pass
     GPIO_HANDLE = None
 
-if ON_PI:
-    init_gpio_pins()
+# The chip is opened on the first Start rather than at import; claims are then
+# kept across Start/Stop and only released when the program exits
+atexit.register(cleanup_gpio)
+
+# time.monotonic_ns() reads CLOCK_MONOTONIC on Linux, so step deadlines can be
+# passed straight to clock_nanosleep(TIMER_ABSTIME) and never drift
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+try:
+    _clock_nanosleep = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).clock_nanosleep
+except (OSError, AttributeError, TypeError):
+    _clock_nanosleep = None
+
+def precise_sleep(deadline_ns):
+    """Sleep until the absolute CLOCK_MONOTONIC time deadline_ns."""
+    if _clock_nanosleep is None:
+        remaining = deadline_ns - time.monotonic_ns()
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+        return
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+
+# Each motor thread asks for SCHED_FIFO on its own core (motor i on core i+1),
+# leaving core 0 to the GUI; needs root or CAP_SYS_NICE, else it runs as usual
+RT_PRIORITY = 10
+RT_WARNED = False
+
+def promote_realtime(cpu, status_callback):
+    """Pin the calling thread to cpu and move it to SCHED_FIFO, warning (once) if it isn't allowed."""
+    global RT_WARNED
+    try:
+        if cpu < os.cpu_count():
+            os.sched_setaffinity(0, {cpu})
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+    except (AttributeError, OSError) as e:
+        if RT_WARNED:
+            return
+        RT_WARNED = True
+        status_callback(f"⚠️ Real-time scheduling unavailable ({e}); step timing is best-effort")
+
+TX_POLL_S = 0.01  # how often a running tx_pulse train is checked on
+
+def tx_steps(step_pin, steps, half_delay_ns, running_flag):
+    """Clock `steps` pulses out on step_pin from lgpio's tx engine and wait for them.
+
+    Returns the steps sent (estimated from elapsed time if running_flag[0]
+    is cleared meanwhile), or None if tx_pulse is unavailable.
+    """
+    if steps <= 0:
+        return 0
+    half_us = max(1, half_delay_ns // 1000)
+    try:
+        lgpio.tx_pulse(GPIO_HANDLE, step_pin, half_us, half_us, 0, steps)
+    except lgpio.error:
+        return None
+    started = time.monotonic_ns()
+    while lgpio.tx_busy(GPIO_HANDLE, step_pin, lgpio.TX_PWM):
+        if not running_flag[0]:
+            lgpio.tx_pulse(GPIO_HANDLE, step_pin, 0, 0)
+            return min(steps, (time.monotonic_ns() - started) // (2000 * half_us))
+        time.sleep(TX_POLL_S)
+    return steps
+
+def simulate_steps(steps, half_delay_ns, running_flag):
+    """Off the Pi, wait out a step train's duration in TX_POLL_S slices
+    instead of sleeping once per step; returns the steps that would have been made."""
+    step_ns = 2 * half_delay_ns
+    started = time.monotonic_ns()
+    while True:
+        elapsed = time.monotonic_ns() - started
+        done = min(steps, elapsed // step_ns)
+        if done >= steps or not running_flag[0]:
+            return done
+        time.sleep(min(TX_POLL_S, (steps * step_ns - elapsed) / 1e9))
 
 class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, delay_seconds, angle_degrees, repetitions,
-                 running_event, steps_moved, idx, status_callback, direction=True):
+    def __init__(self, step_pin, dir_pin, steps_to_move, half_delay_ns, delay_seconds, angle_degrees, repetitions,
+                 running_flag, steps_moved, idx, status_callback, direction=True, stop_event=None):
         super().__init__()
         self.step_pin = step_pin
         self.dir_pin = dir_pin
-        self.speed_rpm = speed_rpm
+        self.steps_to_move = steps_to_move
+        self.half_delay_ns = half_delay_ns
         self.delay_seconds = delay_seconds
         self.angle_degrees = angle_degrees
         self.repetitions = repetitions
-        self.running_event = running_event
+        self.running_flag = running_flag
+        # Set on Stop so the wait between repetitions ends at once
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
         self.steps_moved = steps_moved
         self.idx = idx
         self.status_callback = status_callback
@@ -85,55 +177,86 @@ class MotorThread(threading.Thread):
         self.daemon = True
 
     def run(self):
+        if ON_PI:
+            promote_realtime(self.idx + 1, self.status_callback)
         if self.delay_seconds > 0:
-            time.sleep(self.delay_seconds)
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
-        steps_to_move = max(1, int(STEPS_PER_REV * (self.angle_degrees / 360.0)))
-
-        # Set direction once for all repetitions
+            # Wake early if Stop is pressed during the start delay
+            self.stop_event.wait(self.delay_seconds)
+            if not self.running_flag[0]:
+                self.status_callback(f"Motor {self.idx+1}: thread finished.")
+                return
+        steps_to_move, half_delay_ns = self.steps_to_move, self.half_delay_ns
+
+        # Two step trains per move: up to and including the midpoint step,
+        # then the rest after the direction flip
+        first_half = steps_to_move // 2 + 1
+        dir_value = 1 if self.direction else 0
+        flip_value = 1 - dir_value
+
+        # Set direction once; after that it is only written where it changes
         if ON_PI and GPIO_HANDLE is not None:
-            lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, 1 if self.direction else 0)
+            lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, dir_value)
 
         repetitions_completed = 0
-        while self.running_event.is_set() and repetitions_completed < self.repetitions:
+        while self.running_flag[0] and repetitions_completed < self.repetitions:
             # Perform one move to final position (discrete rotation)
-            if ON_PI and GPIO_HANDLE is not None:
-                lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, 1 if self.direction else 0)
-            self.status_callback(f"Motor {self.idx + 1}: direction changed 1")
-            for id in range(steps_to_move):
-                if not self.running_event.is_set():
-                    break
+            if repetitions_completed:
+                # The previous move left the direction flipped
+                if ON_PI and GPIO_HANDLE is not None:
+                    lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, dir_value)
+                self.status_callback(f"Motor {self.idx + 1}: direction changed 1")
+            self._pulse_steps(first_half, half_delay_ns)
+            if self.running_flag[0]:
                 if ON_PI:
-                    lgpio.gpio_write(GPIO_HANDLE, self.step_pin, 1)
-                    time.sleep(step_delay)
-                    lgpio.gpio_write(GPIO_HANDLE, self.step_pin, 0)
-                    time.sleep(step_delay)
-                else:
-                    time.sleep(step_delay * 2)
-                if id == int(steps_to_move / 2):
-                    if ON_PI:
-                        lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, 0 if self.direction else 1)
-                    self.status_callback(f"Motor {self.idx + 1}: direction changed 0")
-                self.steps_moved[self.idx] += 1
-                
+                    lgpio.gpio_write(GPIO_HANDLE, self.dir_pin, flip_value)
+                self.status_callback(f"Motor {self.idx + 1}: direction changed 0")
+                self._pulse_steps(steps_to_move - first_half, half_delay_ns)
+
             repetitions_completed += 1
             self.status_callback(
                 f"Motor {self.idx+1}: completed {repetitions_completed}/{self.repetitions} rotation(s) of {self.angle_degrees}°."
             )
 
-            if not self.running_event.is_set() or repetitions_completed >= self.repetitions:
+            if not self.running_flag[0] or repetitions_completed >= self.repetitions:
                 break
             # Wait 5 seconds between repetitions
-            for _ in range(50):
-                if not self.running_event.is_set():
-                    break
-                time.sleep(0.1)
+            self.stop_event.wait(5.0)
 
         self.status_callback(f"Motor {self.idx+1}: thread finished.")
 
+    def _pulse_steps(self, steps, half_ns):
+        """Step `steps` times, from lgpio's tx engine when it can; returns the steps made."""
+        if ON_PI and GPIO_HANDLE is not None:
+            sent = tx_steps(self.step_pin, steps, half_ns, self.running_flag)
+            if sent is not None:
+                self.steps_moved[self.idx] += sent
+                return sent
+        if not ON_PI:
+            done = simulate_steps(steps, half_ns, self.running_flag)
+            self.steps_moved[self.idx] += done
+            return done
+        # Bind everything the step loop touches to locals once
+        gw, slp = lgpio.gpio_write, precise_sleep
+        h, sp = GPIO_HANDLE, self.step_pin
+        running_flag = self.running_flag
+        done = 0
+        deadline = time.monotonic_ns()
+        for _ in range(steps):
+            if not running_flag[0]:
+                break
+            gw(h, sp, 1)
+            deadline += half_ns
+            slp(deadline)
+            gw(h, sp, 0)
+            deadline += half_ns
+            slp(deadline)
+            done += 1
+        # Counted locally and stored once per train
+        self.steps_moved[self.idx] += done
+        return done
+
 class MotorControlApp(QMainWindow):
     finished = pyqtSignal()
-    motor_status = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
@@ -150,10 +273,20 @@ class MotorControlApp(QMainWindow):
         self._init_config_tab()
         self._init_status_tab()
         self.finished.connect(self.show_finished)
-        self.motor_status.connect(self.append_status)
 
-        self.steps_moved = [0, 0, 0]
-        self.running_events = [threading.Event() for _ in range(3)]
+        # Motor threads append status lines here (deque appends are
+        # thread-safe); the GUI thread writes them to the log in batches
+        self._status_buffer = deque(maxlen=4096)
+        self._status_timer = QTimer(self)
+        self._status_timer.timeout.connect(self._flush_status)
+        self._status_timer.start(STATUS_FLUSH_MS)
+        self._watch_timer = QTimer(self)
+        self._watch_timer.timeout.connect(self._check_done)
+
+        self.steps_moved = array('q', [0, 0, 0])
+        # One int per motor, read by its thread without a lock: 1 = keep going
+        self.running_flags = [array('i', [0]) for _ in range(3)]
+        self._stop_event = threading.Event()
         self.threads = [None, None, None]
 
     def _init_config_tab(self):
@@ -164,6 +297,10 @@ class MotorControlApp(QMainWindow):
         self.delay_spins = []
         self.angle_combos = []
         self.repeat_spins = []
+        # Each motor's settings and its (steps_to_move, half_delay_ns) plan,
+        # kept current from the widgets' change signals so Start reads plain values
+        self._motor_params = []
+        self._plan = []
         for i in range(3):
             hbox = QHBoxLayout()
             # Speed
@@ -200,6 +337,18 @@ class MotorControlApp(QMainWindow):
             self.delay_spins.append(delay_spin)
             self.angle_combos.append(angle_combo)
             self.repeat_spins.append(repeat_spin)
+            params = {
+                'speed': speed_spin.value(),
+                'delay': delay_spin.value(),
+                'angle': int(angle_combo.currentText()),
+                'reps': repeat_spin.value(),
+            }
+            self._motor_params.append(params)
+            self._plan.append(motor_plan(params['speed'], params['angle']))
+            speed_spin.valueChanged.connect(lambda v, i=i: self._set_param(i, 'speed', v))
+            delay_spin.valueChanged.connect(lambda v, i=i: self._set_param(i, 'delay', v))
+            angle_combo.currentTextChanged.connect(lambda v, i=i: self._set_param(i, 'angle', int(v)))
+            repeat_spin.valueChanged.connect(lambda v, i=i: self._set_param(i, 'reps', v))
         group.setLayout(form)
         vbox.addWidget(group)
 
@@ -213,10 +362,18 @@ class MotorControlApp(QMainWindow):
         vbox.addStretch(1)
         self.config_tab.setLayout(vbox)
 
+    def _set_param(self, i, key, value):
+        params = self._motor_params[i]
+        params[key] = value
+        if key in ('speed', 'angle'):
+            self._plan[i] = motor_plan(params['speed'], params['angle'])
+
     def _init_status_tab(self):
         vlayout = QVBoxLayout()
-        self.status_text = QTextEdit()
+        self.status_text = QPlainTextEdit()
         self.status_text.setReadOnly(True)
+        # Plain-text log capped at 2000 lines so long runs stay cheap to append to
+        self.status_text.setMaximumBlockCount(2000)
         vlayout.addWidget(QLabel("Live Status:"))
         vlayout.addWidget(self.status_text)
 
@@ -229,80 +386,91 @@ class MotorControlApp(QMainWindow):
         self.status_tab.setLayout(vlayout)
 
     def append_status(self, message):
-        self.status_text.append(message)
-        self.tabs.setCurrentWidget(self.status_tab)
+        self.status_text.appendPlainText(message)
+
+    def _flush_status(self):
+        msgs = []
+        while self._status_buffer:
+            msgs.append(self._status_buffer.popleft())
+        if msgs:
+            self.status_text.appendPlainText("\n".join(msgs))
 
     def show_finished(self):
+        self._flush_status()
         self.append_status("✅ All motors finished their configured repetitions.")
         QMessageBox.information(self, "Done", "All motors finished their configured repetitions.")
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
 
-    def _watch_for_completion(self):
-        # Wait for all motor threads to finish
-        for t in self.threads:
-            if t is not None:
-                t.join()
-        self.finished.emit()
+    def _check_done(self):
+        # Polled by _watch_timer while motors run; no thread sits in join()
+        if all(t is None or not t.is_alive() for t in self.threads):
+            self._watch_timer.stop()
+            self.finished.emit()
 
     def start_motors(self):
         init_gpio_pins()
         self.append_status("🚦 Starting motors...")
-        self.steps_moved = [0, 0, 0]
-        speeds = [spin.value() for spin in self.speed_spins]
-        delays = [spin.value() for spin in self.delay_spins]
-        angles = [int(combo.currentText()) for combo in self.angle_combos]
-        reps = [spin.value() for spin in self.repeat_spins]
+        self.tabs.setCurrentWidget(self.status_tab)
+        self.steps_moved = array('q', [0, 0, 0])
+        params = self._motor_params
 
-        for evt in self.running_events:
-            evt.clear()
+        for flag in self.running_flags:
+            flag[0] = 0
+        self._stop_event.clear()
 
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
 
         for idx, m in enumerate(MOTORS):
-            self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                self.motor_status.emit(
-                    f"Motor {idx+1}: speed {speeds[idx]} RPM, delay {delays[idx]:.2f}s, angle {angles[idx]}°, reps {reps[idx]}"
-                )
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    delay_seconds=delays[idx],
-                    angle_degrees=angles[idx],
-                    repetitions=reps[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.motor_status.emit,
-                    direction=True
-                )
-                self.threads[idx] = thread
-                thread.start()
-            threading.Thread(target=run_motor, daemon=True).start()
-
-        # Start watcher thread to emit finished when all done
-        threading.Thread(target=self._watch_for_completion, daemon=True).start()
+            self.running_flags[idx][0] = 1
+            self.append_status(
+                f"Motor {idx+1}: speed {params[idx]['speed']} RPM, delay {params[idx]['delay']:.2f}s, angle {params[idx]['angle']}°, reps {params[idx]['reps']}"
+            )
+            thread = MotorThread(
+                step_pin=m['step'],
+                dir_pin=m['dir'],
+                steps_to_move=self._plan[idx][0],
+                half_delay_ns=self._plan[idx][1],
+                delay_seconds=params[idx]['delay'],
+                angle_degrees=params[idx]['angle'],
+                repetitions=params[idx]['reps'],
+                running_flag=self.running_flags[idx],
+                steps_moved=self.steps_moved,
+                idx=idx,
+                status_callback=self._status_buffer.append,
+                direction=True,
+                stop_event=self._stop_event
+            )
+            self.threads[idx] = thread
+            thread.start()
+
+        # Emit finished once every motor thread is done
+        self._watch_timer.start(500)
 
     def stop_motors(self):
+        self._watch_timer.stop()
+        self._flush_status()
         self.append_status("🛑 Stop pressed: halting all motors...")
         self.stop_btn.setEnabled(False)
+        self.halt_motors()
+        self.finished.emit()
 
-        for evt in self.running_events:
-            evt.clear()
+    def halt_motors(self):
+        """Clear every run flag, wake the repetition waits and join the motor threads."""
+        for flag in self.running_flags:
+            flag[0] = 0
+        self._stop_event.set()
         for t in self.threads:
             if t is not None:
                 t.join(timeout=2)
 
-        if ON_PI:
-            cleanup_gpio()
-        self.finished.emit()
-
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MotorControlApp()
+    # Stop the motor threads before their lines are freed and the chip closed
+    app.aboutToQuit.connect(window.halt_motors)
+    app.aboutToQuit.connect(cleanup_gpio)
     window.resize(560, 360)
     # Ensure not fullscreen on Raspberry Pi
     window.setWindowState(window.windowState() & ~Qt.WindowFullScreen)
@@ -1,7 +1,15 @@
+import ctypes
+import ctypes.util
 import sys
-import threading
 import time
 import os
+import struct
+import multiprocessing
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from time import perf_counter_ns
 
 # Detect if running on Raspberry Pi
 try:
@@ -29,71 +37,373 @@ from PyQt5.QtWidgets import (
     QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QTextEdit,
     QGroupBox, QMessageBox, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import pyqtSignal, Qt, QTimer, QMetaObject, Q_ARG
-from PyQt5.QtGui import QIcon, QTextCursor
-
-# Note: qRegisterMetaType is not available in PyQt5, we'll handle QTextCursor issues differently
+from PyQt5.QtCore import pyqtSignal, Qt, QTimer, QSocketNotifier
+from PyQt5.QtGui import QTextCursor
 
 MOTORS = [
     {'step': 27, 'dir': 17},
     {'step': 23, 'dir': 22},
     {'step': 24, 'dir': 25}
 ]
+# The dir pins are claimed as one lgpio group (DIR_PINS[0] leads it) so all
+# three can be set with a single group_write
+DIR_PINS = tuple(m['dir'] for m in MOTORS)
 STEPS_PER_REV = 400
 
-class MotorThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, running_event, steps_moved, idx, status_callback, direction, start_position, gpio_handle, target_angle=45):
-        super().__init__()
-        self.step_pin = step_pin
-        self.dir_pin = dir_pin
-        self.speed_rpm = speed_rpm
-        self.running_event = running_event
-        self.steps_moved = steps_moved
+# perf_counter_ns() reads CLOCK_MONOTONIC on Linux, so its deadlines can be
+# handed straight to clock_nanosleep(TIMER_ABSTIME) without relative-sleep drift.
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+try:
+    _clock_nanosleep = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).clock_nanosleep
+except (OSError, AttributeError, TypeError):
+    _clock_nanosleep = None
+
+def sleep_until(deadline_ns):
+    """Sleep until the absolute CLOCK_MONOTONIC time deadline_ns."""
+    if _clock_nanosleep is None:
+        remaining = deadline_ns - perf_counter_ns()
+        if remaining > 0:
+            time.sleep(remaining / 1e9)
+        return
+    ts = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    _clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(ts), None)
+
+# Below this much remaining time we spin instead of sleeping; sleeps stop this
+# far short of the deadline so that wake-up latency is absorbed by the spin.
+SPIN_THRESHOLD_NS = 200_000
+SPIN_MARGIN_NS = 150_000
+# Only half-periods shorter than this spin (300 RPM is 250 us); slower ones just sleep
+BUSY_WAIT_BELOW_NS = 500_000
+
+def wait_until(deadline_ns):
+    """Block until perf_counter_ns() reaches deadline_ns (hybrid sleep + spin)."""
+    if deadline_ns - perf_counter_ns() > SPIN_THRESHOLD_NS:
+        sleep_until(deadline_ns - SPIN_MARGIN_NS)
+    while perf_counter_ns() < deadline_ns:
+        pass
+
+# Motor worker threads ask for SCHED_FIFO on core 3, leaving cores 0-2 to the
+# GUI; needs root or CAP_SYS_NICE, else they run as usual
+RT_PRIORITY = 10
+RT_CPU = 3
+RT_WARNED = False
+
+def promote_realtime(status_callback):
+    """Move the calling thread to SCHED_FIFO on RT_CPU, warning (once) if it isn't allowed."""
+    global RT_WARNED
+    try:
+        if RT_CPU < os.cpu_count():
+            os.sched_setaffinity(0, {RT_CPU})
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+    except (AttributeError, OSError) as e:
+        if RT_WARNED:
+            return
+        RT_WARNED = True
+        status_callback(f"⚠️ Real-time scheduling unavailable ({e}); step timing is best-effort")
+
+def gpio_write_sim(handle, gpio, level):
+    """Off the Pi the step edges only keep their timing."""
+
+def group_write_sim(handle, gpio, group_bits, group_mask=0):
+    """Off the Pi direction changes have nothing to drive."""
+
+gpio_write = lgpio.gpio_write if ON_PI else gpio_write_sim
+group_write = lgpio.group_write if ON_PI else group_write_sim
+
+def write_dirs(handle, levels, mask=0b111):
+    """Set the dir pins selected by mask (bit i = motor i) to levels in one write."""
+    bits = 0
+    for i, level in enumerate(levels):
+        bits |= level << i
+    group_write(handle, DIR_PINS[0], bits, mask)
+
+def half_period_ns(speed_rpm):
+    """Half of one step period at speed_rpm, in integer nanoseconds."""
+    return int(60e9 / (STEPS_PER_REV * speed_rpm) / 2)
+
+TX_POLL_S = 0.05  # how often to check on a running tx_pulse train
+
+def tx_steps(handle, step_pin, steps, half_ns, keep_running=None, report=None):
+    """Clock `steps` step pulses out of lgpio's tx engine and wait for them.
+
+    Returns the number of steps sent (estimated from elapsed time if
+    keep_running() turns False), or None if tx_pulse is unavailable so the
+    caller can fall back to toggling the pin itself. report(steps_done)
+    is called each time another 25 steps have gone out.
+    """
+    half_us = max(1, half_ns // 1000)
+    try:
+        lgpio.tx_pulse(handle, step_pin, half_us, half_us, 0, steps)
+    except lgpio.error:
+        return None
+    started = perf_counter_ns()
+    reported = 0
+    while lgpio.tx_busy(handle, step_pin, lgpio.TX_PWM):
+        done = min(steps, (perf_counter_ns() - started) // (2000 * half_us))
+        if keep_running is not None and not keep_running():
+            lgpio.tx_pulse(handle, step_pin, 0, 0)
+            return done
+        if report is not None and done // 25 > reported // 25:
+            reported = done
+            report(done)
+        time.sleep(TX_POLL_S)
+    return steps
+
+def simulate_steps(steps, half_ns, keep_running=None, report=None):
+    """Stand-in for a step train off the Pi: waits out the move's duration in
+    TX_POLL_S slices instead of looping per step.
+
+    Returns the number of steps that would have been sent, calling
+    report(steps_done) each time another 25 steps are done.
+    """
+    started = perf_counter_ns()
+    step_ns = 2 * half_ns
+    reported = 0
+    while True:
+        elapsed = perf_counter_ns() - started
+        done = min(steps, elapsed // step_ns)
+        if done >= steps:
+            return steps
+        if keep_running is not None and not keep_running():
+            return done
+        if report is not None and done // 25 > reported // 25:
+            reported = done
+            report(done)
+        time.sleep(min(TX_POLL_S, (steps * step_ns - elapsed) / 1e9))
+
+class TxTrain:
+    """One motor's step train for drive_trains."""
+    def __init__(self, idx, step_pin, steps, half_ns, delay_s=0.0, on_start=None, report=None):
         self.idx = idx
-        self.status_callback = status_callback
-        self.direction = direction
-        self.daemon = True
-        self.start_position = start_position
+        self.step_pin = step_pin
+        self.steps = steps
+        self.half_us = max(1, half_ns // 1000)
+        self.delay_s = delay_s
+        self.on_start = on_start
+        self.report = report
+        self.started_ns = None
+        self.sent = 0
+
+def drive_trains(handle, trains, keep_running=None):
+    """Start every train at its delay and poll them all from the calling thread.
+
+    lgpio's tx engine clocks each train out, so one thread serves all motors
+    instead of one Python thread per motor. The trains stay per-pin rather
+    than one merged tx_wave: that would need the step pins claimed as a
+    group, which takes them away from tx_pulse, and the motors' start
+    delays and rates differ, so a merged wave carries every edge of all
+    three motors where each train here is a single call. Returns the steps each train
+    sent (estimated from elapsed time if keep_running() turns False), or
+    None if tx_pulse is unavailable so the caller can step in software.
+    """
+    pending = sorted(trains, key=lambda train: train.delay_s)
+    running = []
+    t0 = perf_counter_ns()
+    while pending or running:
+        now = perf_counter_ns()
+        if keep_running is not None and not keep_running():
+            for train in running:
+                lgpio.tx_pulse(handle, train.step_pin, 0, 0)
+                train.sent = min(train.steps, (now - train.started_ns) // (2000 * train.half_us))
+            break
+        while pending and now >= t0 + int(pending[0].delay_s * 1e9):
+            train = pending.pop(0)
+            try:
+                lgpio.tx_pulse(handle, train.step_pin, train.half_us, train.half_us, 0, train.steps)
+            except lgpio.error:
+                if not running:
+                    return None
+                raise
+            train.started_ns = now
+            running.append(train)
+            if train.on_start is not None:
+                train.on_start()
+        for train in list(running):
+            if not lgpio.tx_busy(handle, train.step_pin, lgpio.TX_PWM):
+                train.sent = train.steps
+                running.remove(train)
+                continue
+            done = min(train.steps, (now - train.started_ns) // (2000 * train.half_us))
+            if train.report is not None and done // 25 > train.sent // 25:
+                train.report(done)
+            train.sent = done
+        wait_s = TX_POLL_S
+        if pending:
+            wait_s = min(wait_s, max(0.0, (t0 + int(pending[0].delay_s * 1e9) - perf_counter_ns()) / 1e9))
+        time.sleep(wait_s)
+    return [train.sent for train in trains]
+
+def simulate_trains(trains, keep_running=None):
+    """Off the Pi stand-in for drive_trains: the same start delays, on_start
+    calls and 25-step reports, worked out from elapsed time in TX_POLL_S
+    slices instead of stepping edge by edge.
+
+    Returns the steps each train would have sent by the time it finished or
+    keep_running() turned False.
+    """
+    t0 = perf_counter_ns()
+    while True:
+        if keep_running is not None and not keep_running():
+            break
+        now = perf_counter_ns()
+        busy = False
+        for train in trains:
+            start_ns = t0 + int(train.delay_s * 1e9)
+            if now < start_ns:
+                busy = True
+                continue
+            if train.started_ns is None:
+                train.started_ns = start_ns
+                if train.on_start is not None:
+                    train.on_start()
+            done = min(train.steps, (now - start_ns) // (2000 * train.half_us))
+            if train.report is not None and done // 25 > train.sent // 25:
+                train.report(done)
+            train.sent = done
+            if done < train.steps:
+                busy = True
+        if not busy:
+            break
+        time.sleep(TX_POLL_S)
+    return [train.sent for train in trains]
+
+class StepScheduler:
+    """Steps every motor's move to target from one thread when tx_pulse can't.
+
+    Motor state is kept as parallel arrays (struct-of-arrays) indexed by
+    motor: pins, half-periods, next edge deadline, current level and steps
+    done. Each tick services whichever motor's edge is due first.
+    """
+    def __init__(self, gpio_handle, step_pins, half_periods, delays, steps_to_target,
+                 run_flag, status_callback, on_start=None):
+        n = len(step_pins)
         self.gpio_handle = gpio_handle
-        self.target_angle = target_angle
-        self.steps_to_target = int(STEPS_PER_REV * target_angle / 360)
+        self.step_pins = array('i', step_pins)
+        self.half_ns = array('q', half_periods)
+        self.delays = delays
+        self.steps_to_target = array('q', steps_to_target)
+        self.next_edge_ns = array('q', [0] * n)
+        self.level = array('B', [0] * n)
+        self.steps_done = array('q', [0] * n)
+        self.started = array('B', [0] * n)
+        self.active = [i for i in range(n) if steps_to_target[i] > 0]
+        self.run_flag = run_flag
+        self.status_callback = status_callback
+        self.on_start = on_start
+        self.wait = wait_until if min(half_periods) < BUSY_WAIT_BELOW_NS else sleep_until
+
+    def tick(self):
+        """Wait for the earliest due edge and write it, unless stopped meanwhile."""
+        next_edge_ns = self.next_edge_ns
+        i = min(self.active, key=next_edge_ns.__getitem__)
+        self.wait(next_edge_ns[i])
+        if not self.run_flag[0]:
+            # Stopped while waiting (e.g. out a start delay): don't write the edge
+            return
+        if not self.started[i]:
+            self.started[i] = 1
+            if self.on_start is not None:
+                self.on_start(i)
+        level = self.level[i] ^ 1
+        self.level[i] = level
+        gpio_write(self.gpio_handle, self.step_pins[i], level)
+        next_edge_ns[i] += self.half_ns[i]
+        # The driver steps on the rising edge, so that is where a step is counted
+        if level:
+            done = self.steps_done[i] + 1
+            self.steps_done[i] = done
+            if done % 25 == 0:
+                self.status_callback(f"Motor {i+1}: Moving to target position... ({done}/{self.steps_to_target[i]})")
+        elif self.steps_done[i] >= self.steps_to_target[i]:
+            self.active.remove(i)
 
     def run(self):
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
-        if ON_PI:
-            lgpio.gpio_write(self.gpio_handle, self.dir_pin, 1 if self.direction else 0)
-        
-        # Move to target position
-        steps_moved_to_target = 0
-        while steps_moved_to_target < self.steps_to_target and self.running_event.is_set():
-            if ON_PI:
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 1)
-                time.sleep(step_delay)
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 0)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            steps_moved_to_target += 1
-            self.steps_moved[self.idx] += 1
-            
-            if steps_moved_to_target % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1}: Moving to target position... ({steps_moved_to_target}/{self.steps_to_target})")
-        
-        if steps_moved_to_target >= self.steps_to_target:
-            self.status_callback(f"Motor {self.idx+1}: Reached target position! Waiting 3 seconds...")
-            time.sleep(3)  # Wait 3 seconds at target position
+        """Step until every motor is at target or run_flag[0] is cleared.
 
-class ReturnThread(threading.Thread):
-    def __init__(self, step_pin, dir_pin, speed_rpm, steps_to_return, idx, status_callback, direction, start_position, gpio_handle, return_speed_factor=0.5):
-        super().__init__()
+        Returns the steps each motor made.
+        """
+        start = perf_counter_ns()
+        for i, delay in enumerate(self.delays):
+            self.next_edge_ns[i] = start + int(delay * 1e9)
+        run_flag = self.run_flag
+        while self.active and run_flag[0]:
+            self.tick()
+        # A stop can land mid-pulse; leave every step pin low for the next move
+        for i, level in enumerate(self.level):
+            if level:
+                gpio_write(self.gpio_handle, self.step_pins[i], 0)
+                self.level[i] = 0
+        return list(self.steps_done)
+
+@dataclass(frozen=True, slots=True)
+class SequenceConfig:
+    """Widget values (and what follows from them) snapshotted on the GUI thread
+    at Start; workers only read this."""
+    speeds: tuple
+    delays: tuple
+    angles: tuple
+    starts: tuple
+    reps: int
+    return_together: bool
+    # Step counts and integer half-periods; returns run at half speed, i.e.
+    # twice the half-period
+    targets: tuple
+    half_periods: tuple
+    return_halves: tuple
+    started_messages: tuple
+
+def make_sequence_config(speeds, delays, angles, starts, reps, return_together):
+    """Build a SequenceConfig, working out step counts, half-periods and messages."""
+    half_periods = tuple(half_period_ns(speed) for speed in speeds)
+    return SequenceConfig(
+        speeds=speeds,
+        delays=delays,
+        angles=angles,
+        starts=starts,
+        reps=reps,
+        return_together=return_together,
+        targets=tuple(int(STEPS_PER_REV * angle / 360) for angle in angles),
+        half_periods=half_periods,
+        return_halves=tuple(2 * half_ns for half_ns in half_periods),
+        started_messages=tuple(
+            f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.1f}s delay. [Start: {starts[idx]}, Angle: {angles[idx]}°]"
+            for idx in range(len(speeds))
+        )
+    )
+
+# A sequence goes to the stepper process as one fixed-layout blob: speeds
+# (RPM), delays (s), angles (°), start positions (1 = A) and the
+# return-together flag. Repetitions are counted by the GUI and not sent.
+CONFIG_FMT = '<3H3f3H3BB'
+CONFIG_SIZE = struct.calcsize(CONFIG_FMT)
+# Any other command is a single byte
+CMD_RELEASE = b'r'
+CMD_QUIT = b'q'
+
+def pack_config(cfg):
+    return struct.pack(CONFIG_FMT, *cfg.speeds, *cfg.delays, *cfg.angles,
+                       *(pos == 'A' for pos in cfg.starts), cfg.return_together)
+
+def unpack_config(buf):
+    values = struct.unpack_from(CONFIG_FMT, buf)
+    # Delays come back as float32; round off the noise (0.2 -> 0.2000000029...)
+    return make_sequence_config(values[0:3], tuple(round(delay, 3) for delay in values[3:6]), values[6:9],
+                                tuple('A' if a else 'B' for a in values[9:12]), 1, bool(values[12]))
+
+class ReturnMove:
+    """One motor's return to its start position; run() is called on a pool worker."""
+    def __init__(self, step_pin, half_ns, steps_to_return, idx, status_callback, direction, start_position, gpio_handle):
         self.step_pin = step_pin
-        self.dir_pin = dir_pin
-        self.speed_rpm = speed_rpm * return_speed_factor  # Slower return speed
+        self.half_ns = half_ns
         self.steps_to_return = steps_to_return
         self.idx = idx
         self.status_callback = status_callback
         self.direction = not direction  # Reverse direction for return
-        self.daemon = True
         self.start_position = start_position
         self.gpio_handle = gpio_handle
 
@@ -101,30 +411,286 @@ class ReturnThread(threading.Thread):
         if self.steps_to_return == 0:
             self.status_callback(f"Motor {self.idx+1}: Already at start position.")
             return
-            
-        step_delay = 60.0 / (STEPS_PER_REV * self.speed_rpm) / 2
         if ON_PI:
-            lgpio.gpio_write(self.gpio_handle, self.dir_pin, 1 if self.direction else 0)
+            promote_realtime(self.status_callback)
+            
+        half_ns = self.half_ns
+        write, handle, step_pin = gpio_write, self.gpio_handle, self.step_pin
+        # Only this motor's bit of the dir group is touched
+        group_write(handle, DIR_PINS[0], (1 if self.direction else 0) << self.idx, 1 << self.idx)
         
         self.status_callback(f"Motor {self.idx+1}: Returning {self.steps_to_return} steps to {self.start_position} position...")
         
-        for step in range(self.steps_to_return):
-            if ON_PI:
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 1)
-                time.sleep(step_delay)
-                lgpio.gpio_write(self.gpio_handle, self.step_pin, 0)
-                time.sleep(step_delay)
-            else:
-                time.sleep(step_delay * 2)
-            
-            if step % 25 == 0:
-                self.status_callback(f"Motor {self.idx+1}: Returning... ({step}/{self.steps_to_return})")
+        report = lambda done: self.status_callback(f"Motor {self.idx+1}: Returning... ({done}/{self.steps_to_return})")
+        if ON_PI:
+            sent = tx_steps(handle, step_pin, self.steps_to_return, half_ns, report=report)
+        else:
+            sent = simulate_steps(self.steps_to_return, half_ns, report=report)
+        if sent is None:
+            sleep = wait_until if half_ns < BUSY_WAIT_BELOW_NS else sleep_until
+            step_ns, n = 2 * half_ns, self.steps_to_return
+            # Status goes out between chunks of 25 steps, so the edge loop itself
+            # has nothing to test
+            chunk_ns = 25 * step_ns
+            start_ns = perf_counter_ns()
+            for chunk in range(0, n, 25):
+                chunk_start = start_ns + chunk * step_ns
+                for step_start in range(chunk_start, chunk_start + min(chunk_ns, (n - chunk) * step_ns), step_ns):
+                    write(handle, step_pin, 1)
+                    sleep(step_start + half_ns)
+                    write(handle, step_pin, 0)
+                    sleep(step_start + step_ns)
+                if chunk + 25 < n:
+                    report(chunk + 25)
 
         self.status_callback(f"Motor {self.idx+1}: Returned to start position.")
 
+class SequenceRunner:
+    """Runs one sequence (move to target, dwell, return) at a time inside the
+    stepper process, which owns the lgpio handle.
+
+    run_flag is the byte shared with the GUI process; every status line goes
+    out through status_callback.
+    """
+    def __init__(self, run_flag, status_callback):
+        self.run_flag = run_flag
+        self.status_callback = status_callback
+        self.gpio_handle = None
+        self.steps_moved = [0, 0, 0]
+        self.start_positions = ('A', 'A', 'A')
+        # Parallel returns run on one long-lived pool
+        self._pool = ThreadPoolExecutor(max_workers=len(MOTORS), thread_name_prefix="return")
+
+    def open_gpio(self):
+        """Open the chip and claim the pins: step pins one by one (tx_pulse
+        drives each on its own), dir pins as one group."""
+        if self.gpio_handle is not None:
+            return
+        self.gpio_handle = lgpio.gpiochip_open(0)
+        if self.gpio_handle < 0:
+            self.gpio_handle = None
+            raise RuntimeError("Failed to open GPIO chip")
+        for m in MOTORS:
+            lgpio.gpio_claim_output(self.gpio_handle, 0, m['step'], 0)
+        lgpio.group_claim_output(self.gpio_handle, list(DIR_PINS), [0] * len(DIR_PINS))
+
+    def close_gpio(self):
+        if self.gpio_handle is None:
+            return
+        try:
+            lgpio.gpiochip_close(self.gpio_handle)
+        except:
+            pass
+        self.gpio_handle = None
+
+    def run(self, cfg):
+        """Run one sequence of motor movements.
+
+        Returns True if it ran to the end, False if run_flag[0] was cleared.
+        """
+        if ON_PI:
+            promote_realtime(self.status_callback)
+        self.start_positions = cfg.starts
+        self.steps_moved = [0, 0, 0]
+        delays, targets = cfg.delays, cfg.targets
+        half_periods, started = cfg.half_periods, cfg.started_messages
+
+        # This one thread starts every motor at its delay, waits for all of
+        # them, then hands over to the return
+        if ON_PI:
+            sent = self._drive_to_target(half_periods, delays, targets, started)
+            if sent is None:
+                sent = self._step_to_target(half_periods, delays, targets, started)
+        else:
+            # Nothing to drive: just account for the time the move would take
+            sent = simulate_trains(self._target_trains(half_periods, delays, targets, started),
+                                   lambda: self.run_flag[0])
+
+        reached = False
+        for idx, steps in enumerate(sent):
+            self.steps_moved[idx] = steps
+            if steps >= targets[idx]:
+                reached = True
+                self.status_callback(f"Motor {idx+1}: Reached target position! Waiting 3 seconds...")
+        if reached:
+            # Wait 3 seconds at target position, in slices so a stop isn't held up
+            for _ in range(30):
+                if not self.run_flag[0]:
+                    break
+                time.sleep(0.1)
+
+        if not self.run_flag[0]:
+            return False
+
+        self.status_callback("⏳ All motors reached target. Starting return sequence...")
+
+        if cfg.return_together:
+            # Return all motors together
+            self.return_all_motors_together(cfg.return_halves)
+        else:
+            # Return motors individually
+            self.return_motors_individually(cfg.return_halves)
+        return bool(self.run_flag[0])
+
+    def _drive_to_target(self, half_periods, delays, targets, started):
+        """Clock every motor's move out of lgpio's tx engine from this one thread.
+
+        Returns the steps each motor sent, or None if tx_pulse is unavailable.
+        """
+        write_dirs(self.gpio_handle, [1 if pos == 'A' else 0 for pos in self.start_positions])
+        trains = self._target_trains(half_periods, delays, targets, started)
+        return drive_trains(self.gpio_handle, trains, lambda: self.run_flag[0])
+
+    def _target_trains(self, half_periods, delays, targets, started):
+        """One TxTrain per motor for the move to target."""
+        trains = []
+        for idx, m in enumerate(MOTORS):
+            trains.append(TxTrain(
+                idx, m['step'], targets[idx], half_periods[idx], delays[idx],
+                on_start=lambda idx=idx: self.status_callback(started[idx]),
+                report=lambda done, idx=idx: self.status_callback(
+                    f"Motor {idx+1}: Moving to target position... ({done}/{targets[idx]})")
+            ))
+        return trains
+
+    def _step_to_target(self, half_periods, delays, targets, started):
+        """Software path: one StepScheduler steps every motor from this thread.
+
+        Returns the steps each motor made.
+        """
+        write_dirs(self.gpio_handle, [1 if pos == 'A' else 0 for pos in self.start_positions])
+        return StepScheduler(
+            gpio_handle=self.gpio_handle,
+            step_pins=[m['step'] for m in MOTORS],
+            half_periods=half_periods,
+            delays=delays,
+            steps_to_target=targets,
+            run_flag=self.run_flag,
+            status_callback=self.status_callback,
+            on_start=lambda idx: self.status_callback(started[idx])
+        ).run()
+
+    def return_all_motors_together(self, return_halves):
+        """Return all motors to start position together"""
+        if ON_PI and self._drive_return_together(return_halves) is not None:
+            return
+
+        return_futures = []
+        for idx, m in enumerate(MOTORS):
+            if self.steps_moved[idx] > 0:
+                rt = ReturnMove(
+                    step_pin=m['step'],
+                    half_ns=return_halves[idx],
+                    steps_to_return=self.steps_moved[idx],
+                    idx=idx,
+                    status_callback=self.status_callback,
+                    direction=True if self.start_positions[idx] == 'A' else False,
+                    start_position=self.start_positions[idx],
+                    gpio_handle=self.gpio_handle
+                )
+                return_futures.append(self._pool.submit(rt.run))
+
+        # Wait for all returns to complete
+        wait(return_futures)
+
+    def _drive_return_together(self, return_halves):
+        """Clock every motor's return out of lgpio's tx engine from this one thread.
+
+        Returns the steps each motor sent, or None if tx_pulse is unavailable.
+        """
+        # Returns run the other way, as in ReturnMove
+        write_dirs(self.gpio_handle, [0 if pos == 'A' else 1 for pos in self.start_positions])
+        trains = []
+        for idx, m in enumerate(MOTORS):
+            steps = self.steps_moved[idx]
+            if steps == 0:
+                continue
+            trains.append(TxTrain(
+                idx, m['step'], steps, return_halves[idx],
+                on_start=lambda idx=idx, steps=steps: self.status_callback(
+                    f"Motor {idx+1}: Returning {steps} steps to {self.start_positions[idx]} position..."),
+                report=lambda done, idx=idx, steps=steps: self.status_callback(
+                    f"Motor {idx+1}: Returning... ({done}/{steps})")
+            ))
+        sent = drive_trains(self.gpio_handle, trains, lambda: self.run_flag[0])
+        if sent is None:
+            return None
+        for train, steps in zip(trains, sent):
+            # A stop cuts the trains short; only a full train is back at the start
+            if steps == train.steps:
+                self.status_callback(f"Motor {train.idx+1}: Returned to start position.")
+        return sent
+
+    def return_motors_individually(self, return_halves):
+        """Return motors to start position one by one"""
+        for idx, m in enumerate(MOTORS):
+            if not self.run_flag[0]:
+                break
+            if self.steps_moved[idx] > 0:
+                rt = ReturnMove(
+                    step_pin=m['step'],
+                    half_ns=return_halves[idx],
+                    steps_to_return=self.steps_moved[idx],
+                    idx=idx,
+                    status_callback=self.status_callback,
+                    direction=True if self.start_positions[idx] == 'A' else False,
+                    start_position=self.start_positions[idx],
+                    gpio_handle=self.gpio_handle
+                )
+                rt.run()
+
+            # Wait before next motor returns
+            if idx < len(MOTORS) - 1:
+                time.sleep(1)
+
+def stepper_process(commands, events, run_flag):
+    """Entry point of the stepper process.
+
+    Receives a packed config (see CONFIG_FMT) to run a sequence, or
+    CMD_RELEASE / CMD_QUIT, on commands; sends ('status', line), ('complete', None), ('released', None),
+    ('gpio_error', message) and ('sequence_error', message) back on events.
+    """
+    send_lock = threading.Lock()  # the return pool reports from several threads
+
+    def send(kind, payload=None):
+        with send_lock:
+            events.send((kind, payload))
+
+    runner = SequenceRunner(run_flag, lambda line: send('status', line))
+    while True:
+        try:
+            command = commands.recv_bytes()
+        except EOFError:
+            command = CMD_QUIT
+        if len(command) == CONFIG_SIZE:
+            if ON_PI and runner.gpio_handle is None:
+                try:
+                    runner.open_gpio()
+                except Exception as e:
+                    runner.close_gpio()
+                    send('gpio_error', str(e))
+                    continue
+                send('status', "✅ GPIO pins initialized successfully with lgpio")
+            try:
+                completed = runner.run(unpack_config(command))
+            except Exception as e:
+                # A write or tx call failed mid-sequence: stop whatever is
+                # still stepping and drop the chip so the next Start reopens it
+                run_flag[0] = 0
+                runner.close_gpio()
+                send('sequence_error', str(e))
+                continue
+            if completed:
+                send('complete')
+        elif command == CMD_RELEASE:
+            runner.close_gpio()
+            send('released')
+        else:
+            runner.close_gpio()
+            return
+
 class MotorControlApp(QMainWindow):
     finished = pyqtSignal()
-    motor_status = pyqtSignal(str)
     sequence_complete = pyqtSignal()
 
     def __init__(self):
@@ -141,62 +707,33 @@ class MotorControlApp(QMainWindow):
 
         self._init_config_tab()
         self._init_status_tab()
-        self.finished.connect(self.show_finished)
-        self.motor_status.connect(self.append_status)
-        self.sequence_complete.connect(self.on_sequence_complete)
+        # Queued, so these slots run after the status drain that emitted them
+        self.finished.connect(self.show_finished, Qt.QueuedConnection)
+        self.sequence_complete.connect(self.on_sequence_complete, Qt.QueuedConnection)
+
+        # The stepper runs in its own process so step timing never waits on
+        # the GUI for the GIL. Commands go down one pipe, status lines and
+        # events come back up the other; the run flag is one shared byte the
+        # stepper polls (no lock) to see whether to keep stepping.
+        ctx = multiprocessing.get_context('spawn')
+        self._run_flag = ctx.RawArray('B', 1)
+        commands_in, self._commands = ctx.Pipe(duplex=False)
+        self._events, events_out = ctx.Pipe(duplex=False)
+        self._stepper = ctx.Process(target=stepper_process, args=(commands_in, events_out, self._run_flag),
+                                    name="stepper", daemon=True)
+        self._stepper.start()
+        commands_in.close()
+        events_out.close()
+
+        # The event loop wakes us only when the stepper has written to the
+        # pipe; whatever has arrived by then is flushed to the log in one go
+        self._status_notifier = QSocketNotifier(self._events.fileno(), QSocketNotifier.Read, self)
+        self._status_notifier.activated.connect(lambda _fd: self._drain_status())
 
-        self.steps_moved = [0, 0, 0]
-        self.running_events = [threading.Event() for _ in range(3)]
-        self.threads = [None, None, None]
-        self.return_threads = []
-        self.start_positions = ['A', 'A', 'A']  # default
-        self.gpio_handle = None
         self.current_rep = 0
         self.total_reps = 1
         self.is_running_sequence = False
 
-    def emit_motor_status_safe(self, message):
-        """Thread-safe method to emit motor_status signal"""
-        try:
-            QTimer.singleShot(0, lambda: self._emit_motor_status_safe(message))
-        except Exception as e:
-            # Fallback: try direct emission
-            try:
-                self.motor_status.emit(message)
-            except:
-                pass  # Ignore errors to prevent crashes
-
-    def _emit_motor_status_safe(self, message):
-        """Internal method to safely emit motor_status signal"""
-        try:
-            self.motor_status.emit(message)
-        except Exception as e:
-            # If signal emission fails, try to append directly
-            try:
-                self.append_status(message)
-            except:
-                pass
-
-    def emit_sequence_complete_safe(self):
-        """Thread-safe method to emit sequence_complete signal"""
-        try:
-            QTimer.singleShot(0, lambda: self.sequence_complete.emit())
-        except Exception as e:
-            try:
-                self.sequence_complete.emit()
-            except:
-                pass
-
-    def emit_finished_safe(self):
-        """Thread-safe method to emit finished signal"""
-        try:
-            QTimer.singleShot(0, lambda: self.finished.emit())
-        except Exception as e:
-            try:
-                self.finished.emit()
-            except:
-                pass
-
     def _init_config_tab(self):
         vbox = QVBoxLayout()
         
@@ -299,6 +836,12 @@ class MotorControlApp(QMainWindow):
         vlayout = QVBoxLayout()
         self.status_text = QTextEdit()
         self.status_text.setReadOnly(True)
+        # A long-running log: plain text, no undo history, no rewrapping, and
+        # only the newest lines kept so each append stays cheap
+        self.status_text.setAcceptRichText(False)
+        self.status_text.setUndoRedoEnabled(False)
+        self.status_text.setLineWrapMode(QTextEdit.NoWrap)
+        self.status_text.document().setMaximumBlockCount(500)
         vlayout.addWidget(QLabel("Live Status:"))
         vlayout.addWidget(self.status_text)
         
@@ -311,28 +854,45 @@ class MotorControlApp(QMainWindow):
         self.status_tab.setLayout(vlayout)
 
     def append_status(self, message):
-        """Thread-safe method to append status messages"""
-        try:
-            # Use QTimer to ensure this runs on the main thread
-            QTimer.singleShot(0, lambda: self._append_status_safe(message))
-        except Exception as e:
-            # Fallback to direct append if timer fails
-            try:
-                self.status_text.append(message)
-            except:
-                pass  # Ignore any errors to prevent crashes
+        """Insert message as plain text at the end of the log and scroll there once.
 
-    def _append_status_safe(self, message):
-        """Internal method to safely append status (called from main thread)"""
+        GUI thread only; the stepper process reports through _drain_status.
+        """
+        status_text = self.status_text
+        status_text.moveCursor(QTextCursor.End)
+        if not status_text.document().isEmpty():
+            message = "\n" + message
+        status_text.insertPlainText(message)
+        status_text.moveCursor(QTextCursor.End)
+
+    def _drain_status(self):
+        """Log the stepper's status lines and act on its events, in the order sent."""
+        lines = []
         try:
-            self.status_text.append(message)
-        except Exception as e:
-            # If there's still an issue, try to clear and re-append
-            try:
-                self.status_text.clear()
-                self.status_text.append(message)
-            except:
-                pass  # Final fallback - ignore errors
+            while self._events.poll():
+                kind, payload = self._events.recv()
+                if kind == 'status':
+                    lines.append(payload)
+                    continue
+                if lines:
+                    self.append_status("\n".join(lines))
+                    lines = []
+                if kind == 'complete':
+                    self.sequence_complete.emit()
+                elif kind == 'released':
+                    self.on_motors_released()
+                elif kind == 'gpio_error':
+                    self.on_gpio_error(payload)
+                elif kind == 'sequence_error':
+                    self.on_sequence_error(payload)
+        except EOFError:
+            self._status_notifier.setEnabled(False)
+            self.is_running_sequence = False
+            self.start_btn.setEnabled(True)
+            self.stop_btn.setEnabled(False)
+            lines.append("❌ Stepper process exited")
+        if lines:
+            self.append_status("\n".join(lines))
 
     def show_finished(self):
         self.append_status("✅ All sequences completed!")
@@ -343,20 +903,30 @@ class MotorControlApp(QMainWindow):
 
     def on_sequence_complete(self):
         """Called when one sequence is complete"""
+        if not self.is_running_sequence:
+            return
         self.current_rep += 1
         if self.current_rep < self.total_reps:
             self.append_status(f"🔄 Sequence {self.current_rep} complete. Starting sequence {self.current_rep + 1}/{self.total_reps}...")
             # Wait 2-5 seconds before next sequence
-            wait_time = 2 if self.return_together_cb.isChecked() else 5
+            wait_time = 2 if self._cfg.return_together else 5
             self.append_status(f"⏳ Waiting {wait_time} seconds before next sequence...")
             QTimer.singleShot(wait_time * 1000, self.run_single_sequence)
         else:
             self.append_status("🎉 All sequences completed!")
-            self.emit_finished_safe()
+            self.finished.emit()
 
     def start_sequence(self):
         """Start the complete sequence with repetitions"""
-        self.total_reps = self.rep_spin.value()
+        speeds = tuple(spin.value() for spin in self.speed_spins)
+        angles = tuple(spin.value() for spin in self.angle_spins)
+        delays = tuple(spin.value() for spin in self.delay_spins)
+        starts = tuple(cb.currentText() for cb in self.pos_combos)
+        self._cfg = make_sequence_config(speeds, delays, angles, starts, self.rep_spin.value(),
+                                         self.return_together_cb.isChecked())
+        # Packed once; every repetition sends the same blob
+        self._cfg_blob = pack_config(self._cfg)
+        self.total_reps = self._cfg.reps
         self.current_rep = 0
         self.is_running_sequence = True
         
@@ -364,33 +934,8 @@ class MotorControlApp(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         
-        # Initialize GPIO if on Raspberry Pi
-        if ON_PI:
-            try:
-                # Initialize lgpio
-                self.gpio_handle = lgpio.gpiochip_open(0)
-                if self.gpio_handle < 0:
-                    raise RuntimeError("Failed to open GPIO chip")
-                
-                # Setup GPIO pins
-                for m in MOTORS:
-                    # Configure step pin as output
-                    lgpio.gpio_claim_output(self.gpio_handle, 0, m['step'], 0)
-                    # Configure dir pin as output
-                    lgpio.gpio_claim_output(self.gpio_handle, 0, m['dir'], 0)
-                
-                self.append_status("✅ GPIO pins initialized successfully with lgpio")
-            except Exception as e:
-                self.append_status(f"❌ GPIO Error: {e}")
-                self.append_status("💡 Try running with sudo or check if GPIO pins are in use")
-                QMessageBox.critical(self, "GPIO Error", 
-                                   f"Failed to initialize GPIO: {e}\n\n"
-                                   "Try running with sudo or check if GPIO pins are already in use.")
-                self.start_btn.setEnabled(True)
-                self.stop_btn.setEnabled(False)
-                return
-        
-        # Start the first sequence
+        # Start the first sequence; the stepper process opens the GPIO chip
+        # with it and answers with a gpio_error if it can't
         self.run_single_sequence()
 
     def run_single_sequence(self):
@@ -399,186 +944,73 @@ class MotorControlApp(QMainWindow):
             return
             
         self.append_status(f"🔄 Running sequence {self.current_rep + 1}/{self.total_reps}")
-        
-        self.start_positions = [cb.currentText() for cb in self.pos_combos]
-        self.steps_moved = [0, 0, 0]
-        speeds = [spin.value() for spin in self.speed_spins]
-        delays = [spin.value() for spin in self.delay_spins]
-        angles = [spin.value() for spin in self.angle_spins]
-        
-        # Clear any previous running events
-        for evt in self.running_events:
-            evt.clear()
-        
-        # Start motors with delays
-        for idx, m in enumerate(MOTORS):
-            self.running_events[idx].set()
-            def run_motor(idx=idx, m=m):
-                time.sleep(delays[idx])
-                if not self.is_running_sequence:
-                    return
-                    
-                self.emit_motor_status_safe(
-                    f"Motor {idx+1}: started at speed {speeds[idx]} RPM after {delays[idx]:.1f}s delay. [Start: {self.start_positions[idx]}, Angle: {angles[idx]}°]"
-                )
-                
-                thread = MotorThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    running_event=self.running_events[idx],
-                    steps_moved=self.steps_moved,
-                    idx=idx,
-                    status_callback=self.emit_motor_status_safe,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx],
-                    gpio_handle=self.gpio_handle,
-                    target_angle=angles[idx]
-                )
-                self.threads[idx] = thread
-                thread.start()
-                
-            threading.Thread(target=run_motor).start()
-        
-        # Wait for all motors to reach target and complete 3-second wait
-        def wait_and_return():
-            # Wait for all motors to complete their movement
-            for t in self.threads:
-                if t and t.is_alive():
-                    t.join()
-            
-            if not self.is_running_sequence:
-                return
-                
-            self.append_status("⏳ All motors reached target. Starting return sequence...")
-            
-            if self.return_together_cb.isChecked():
-                # Return all motors together
-                self.return_all_motors_together(speeds)
-            else:
-                # Return motors individually
-                self.return_motors_individually(speeds)
-        
-        threading.Thread(target=wait_and_return, daemon=True).start()
+        self._run_flag[0] = 1
+        self._send_command(self._cfg_blob)
 
-    def return_all_motors_together(self, speeds):
-        """Return all motors to start position together"""
-        self.return_threads = []
-        
-        for idx, m in enumerate(MOTORS):
-            if self.steps_moved[idx] > 0:
-                rt = ReturnThread(
-                    step_pin=m['step'],
-                    dir_pin=m['dir'],
-                    speed_rpm=speeds[idx],
-                    steps_to_return=self.steps_moved[idx],
-                    idx=idx,
-                    status_callback=self.emit_motor_status_safe,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx],
-                    gpio_handle=self.gpio_handle,
-                    return_speed_factor=0.5
-                )
-                self.return_threads.append(rt)
-                rt.start()
-        
-        # Wait for all return threads to complete
-        def finish_return():
-            for rt in self.return_threads:
-                if rt and rt.is_alive():
-                    rt.join()
-            if self.is_running_sequence:
-                self.emit_sequence_complete_safe()
-        
-        threading.Thread(target=finish_return, daemon=True).start()
+    def _send_command(self, command):
+        """Send a command to the stepper process; False if it is gone."""
+        try:
+            self._commands.send_bytes(command)
+            return True
+        except OSError:
+            self.is_running_sequence = False
+            self._run_flag[0] = 0
+            self.append_status("❌ Stepper process is not running")
+            self.start_btn.setEnabled(True)
+            self.stop_btn.setEnabled(False)
+            return False
 
-    def return_motors_individually(self, speeds):
-        """Return motors to start position one by one"""
-        def return_individual(idx=0):
-            if idx >= len(MOTORS) or not self.is_running_sequence:
-                self.emit_sequence_complete_safe()
-                return
-                
-            if self.steps_moved[idx] > 0:
-                rt = ReturnThread(
-                    step_pin=MOTORS[idx]['step'],
-                    dir_pin=MOTORS[idx]['dir'],
-                    speed_rpm=speeds[idx],
-                    steps_to_return=self.steps_moved[idx],
-                    idx=idx,
-                    status_callback=self.emit_motor_status_safe,
-                    direction=True if self.start_positions[idx] == 'A' else False,
-                    start_position=self.start_positions[idx],
-                    gpio_handle=self.gpio_handle,
-                    return_speed_factor=0.5
-                )
-                rt.start()
-                rt.join()
-            
-            # Wait before next motor returns
-            if idx < len(MOTORS) - 1:
-                time.sleep(1)
-            
-            # Return next motor
-            return_individual(idx + 1)
-        
-        threading.Thread(target=return_individual, daemon=True).start()
+    def on_gpio_error(self, error):
+        """The stepper process could not open or claim the GPIO pins"""
+        self.is_running_sequence = False
+        self._run_flag[0] = 0
+        self.append_status(f"❌ GPIO Error: {error}")
+        self.append_status("💡 Try running with sudo or check if GPIO pins are in use")
+        QMessageBox.critical(self, "GPIO Error", 
+                           f"Failed to initialize GPIO: {error}\n\n"
+                           "Try running with sudo or check if GPIO pins are already in use.")
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+
+    def on_sequence_error(self, error):
+        """A GPIO call failed while the stepper process was running a sequence"""
+        self.is_running_sequence = False
+        self._run_flag[0] = 0
+        self.append_status(f"❌ Motor Error: {error}")
+        QMessageBox.critical(self, "Motor Error", f"Sequence stopped: {error}")
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+
+    def on_motors_released(self):
+        """The stepper process has stopped the motors and closed the GPIO chip"""
+        self.append_status("🛑 All motors stopped.")
+        self.start_btn.setEnabled(True)
 
     def stop_motors(self):
         """Stop all motors and reset sequence"""
         self.append_status("🛑 Stop requested. Halting all motors...")
         self.is_running_sequence = False
-        
-        # Stop all running events
-        for evt in self.running_events:
-            evt.clear()
-        
-        # Wait for threads to finish
-        for t in self.threads:
-            if t and t.is_alive():
-                t.join(timeout=2)
-        
-        for rt in self.return_threads:
-            if rt and rt.is_alive():
-                rt.join(timeout=2)
-        
-        # Cleanup GPIO
-        if ON_PI and self.gpio_handle:
-            try:
-                lgpio.gpiochip_close(self.gpio_handle)
-            except:
-                pass
-        
-        self.append_status("🛑 All motors stopped.")
-        self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        
+        # Stop the stepper; it releases the GPIO chip once the motors are
+        # down and Start comes back on when it says so
+        self._run_flag[0] = 0
+        self._send_command(CMD_RELEASE)
 
     def close_application(self):
         """Close the application with proper cleanup"""
         self.is_running_sequence = False
         
-        # Stop any running motors first
-        if hasattr(self, 'running_events'):
-            for event in self.running_events:
-                event.clear()
-        
-        # Wait for threads to finish
-        if hasattr(self, 'threads'):
-            for thread in self.threads:
-                if thread and thread.is_alive():
-                    thread.join(timeout=1)
-        
-        if hasattr(self, 'return_threads'):
-            for thread in self.return_threads:
-                if thread and thread.is_alive():
-                    thread.join(timeout=1)
-        
-        # Cleanup GPIO if on Raspberry Pi
-        if ON_PI and self.gpio_handle:
+        # Stop any running motors and let the stepper process close the GPIO chip
+        if hasattr(self, '_stepper'):
+            self._run_flag[0] = 0
             try:
-                lgpio.gpiochip_close(self.gpio_handle)
-            except:
+                self._commands.send_bytes(CMD_QUIT)
+            except OSError:
                 pass
+            self._stepper.join(timeout=1)
+            if self._stepper.is_alive():
+                self._stepper.terminate()
         
         # Close the application
         self.close()
@@ -19,6 +19,19 @@ for pin in 17 22 24 27 23 25; do
     fi
 done
 
+# Prefer the free-threaded interpreter so the motor threads run on separate cores,
+# but only if it has the Qt and GPIO bindings installed and the GIL is still off
+# once they are loaded (3.13t re-enables it for extensions that don't declare
+# Py_mod_gil, and then there is no point using it)
+PYTHON=python3
+if command -v python3.13t >/dev/null 2>&1 && \
+   python3.13t -c "import PyQt5, RPi.GPIO, sys; sys.exit(sys._is_gil_enabled())" >/dev/null 2>&1; then
+    PYTHON=python3.13t
+    echo "🧵 Using free-threaded $PYTHON (no GIL)"
+elif command -v python3.13t >/dev/null 2>&1; then
+    echo "ℹ️  python3.13t would re-enable the GIL for PyQt5/RPi.GPIO; using $PYTHON"
+fi
+
 # Set Qt environment variables for Raspberry Pi
 export QT_QPA_PLATFORM=eglfs
 export QT_QPA_EGLFS_PHYSICAL_WIDTH=800
@@ -26,20 +39,20 @@ export QT_QPA_EGLFS_PHYSICAL_HEIGHT=600
 
 # Try to run the application
 echo "Attempting to run with eglfs platform..."
-python3 main2.1.py
+$PYTHON main2.1.py
 
 # If eglfs fails, try offscreen
 if [ $? -ne 0 ]; then
     echo "eglfs failed, trying offscreen platform..."
     export QT_QPA_PLATFORM=offscreen
-    python3 main2.1.py
+    $PYTHON main2.1.py
 fi
 
 # If offscreen fails, try linuxfb
 if [ $? -ne 0 ]; then
     echo "offscreen failed, trying linuxfb platform..."
     export QT_QPA_PLATFORM=linuxfb
-    python3 main2.1.py
+    $PYTHON main2.1.py
 fi
 
 # If all fail, provide instructions
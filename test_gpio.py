@@ -20,26 +20,28 @@ def check_gpio_permissions():
     
     # Check if GPIO module is loaded
     try:
-        with open('/proc/modules', 'r') as f:
+        with open('/proc/modules', 'rb') as f:
             modules = f.read()
-            if 'bcm2835' in modules:
+            if b'bcm2835' in modules:
                 print("✅ BCM2835 GPIO module is loaded")
             else:
                 print("⚠️  BCM2835 GPIO module not found")
     except:
         print("❌ Cannot read /proc/modules")
     
-    # Check GPIO sysfs
+    # Check GPIO sysfs (opening it once tells us both whether it exists and
+    # whether we can read it)
     gpio_path = '/sys/class/gpio'
-    if os.path.exists(gpio_path):
+    try:
+        with os.scandir(gpio_path):
+            pass
         print("✅ GPIO sysfs exists")
-        try:
-            os.listdir(gpio_path)
-            print("✅ Can read GPIO sysfs")
-        except PermissionError:
-            print("❌ Permission denied accessing GPIO sysfs")
-    else:
+        print("✅ Can read GPIO sysfs")
+    except FileNotFoundError:
         print("❌ GPIO sysfs not found")
+    except PermissionError:
+        print("✅ GPIO sysfs exists")
+        print("❌ Permission denied accessing GPIO sysfs")
 
 def test_gpio_import():
     """Test if RPi.GPIO can be imported"""
@@ -56,23 +58,31 @@ def test_gpio_import():
         print(f"❌ Unexpected error importing RPi.GPIO: {e}")
         return None
 
+def flush_lines(out):
+    """Write the buffered status lines with one write() and empty the buffer."""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        out.clear()
+
 def test_gpio_setup(gpio):
     """Test GPIO setup"""
     if not gpio:
         return False
     
     print("\n🔍 Testing GPIO setup...")
+    # Progress lines are buffered and written once; errors flush them and print at once
+    out = []
     try:
         # Clean up any existing setup
         gpio.cleanup()
         
         # Set mode
         gpio.setmode(gpio.BCM)
-        print("✅ GPIO mode set to BCM")
+        out.append("✅ GPIO mode set to BCM")
         
         # Set warnings to False
         gpio.setwarnings(False)
-        print("✅ GPIO warnings disabled")
+        out.append("✅ GPIO warnings disabled")
         
         # Test pins
         test_pins = [17, 22, 24, 27, 23, 25]
@@ -80,20 +90,24 @@ def test_gpio_setup(gpio):
             try:
                 gpio.setup(pin, gpio.OUT)
                 gpio.output(pin, gpio.LOW)
-                print(f"✅ GPIO pin {pin} setup successful")
+                out.append(f"✅ GPIO pin {pin} setup successful")
             except Exception as e:
+                flush_lines(out)
                 print(f"❌ GPIO pin {pin} setup failed: {e}")
         
         # Clean up
         gpio.cleanup()
-        print("✅ GPIO cleanup successful")
+        out.append("✅ GPIO cleanup successful")
+        flush_lines(out)
         return True
         
     except RuntimeError as e:
+        flush_lines(out)
         print(f"❌ RuntimeError during GPIO setup: {e}")
         print("💡 This usually means insufficient permissions or hardware access issues")
         return False
     except Exception as e:
+        flush_lines(out)
         print(f"❌ Unexpected error during GPIO setup: {e}")
         return False
 
@@ -103,9 +117,10 @@ def check_system_info():
     
     # Check if we're on Raspberry Pi
     try:
-        with open('/proc/cpuinfo', 'r') as f:
+        # Bytes are enough for a substring check; no need to decode the file
+        with open('/proc/cpuinfo', 'rb') as f:
             cpuinfo = f.read()
-            if 'Raspberry Pi' in cpuinfo:
+            if b'Raspberry Pi' in cpuinfo:
                 print("✅ Running on Raspberry Pi")
             else:
                 print("⚠️  Not running on Raspberry Pi")
@@ -20,26 +20,28 @@ def check_lgpio_permissions():
     
     # Check if lgpio module is available
     try:
-        with open('/proc/modules', 'r') as f:
+        with open('/proc/modules', 'rb') as f:
             modules = f.read()
-            if 'gpiochip' in modules or 'bcm2835' in modules:
+            if b'gpiochip' in modules or b'bcm2835' in modules:
                 print("✅ GPIO modules are loaded")
             else:
                 print("⚠️  GPIO modules not found")
     except:
         print("❌ Cannot read /proc/modules")
     
-    # Check GPIO sysfs
+    # Check GPIO sysfs (opening it once tells us both whether it exists and
+    # whether we can read it)
     gpio_path = '/sys/class/gpio'
-    if os.path.exists(gpio_path):
+    try:
+        with os.scandir(gpio_path):
+            pass
         print("✅ GPIO sysfs exists")
-        try:
-            os.listdir(gpio_path)
-            print("✅ Can read GPIO sysfs")
-        except PermissionError:
-            print("❌ Permission denied accessing GPIO sysfs")
-    else:
+        print("✅ Can read GPIO sysfs")
+    except FileNotFoundError:
         print("❌ GPIO sysfs not found")
+    except PermissionError:
+        print("✅ GPIO sysfs exists")
+        print("❌ Permission denied accessing GPIO sysfs")
 
 def test_lgpio_import():
     """Test if lgpio can be imported"""
@@ -56,19 +58,27 @@ def test_lgpio_import():
         print(f"❌ Unexpected error importing lgpio: {e}")
         return None
 
+def flush_lines(out):
+    """Write the buffered status lines with one write() and empty the buffer."""
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
+        out.clear()
+
 def test_lgpio_setup(lgpio_module):
     """Test lgpio setup"""
     if not lgpio_module:
         return False
     
     print("\n🔍 Testing lgpio setup...")
+    # Progress lines are buffered and written once; errors flush them and print at once
+    out = []
     try:
         # Open GPIO chip
         handle = lgpio_module.gpiochip_open(0)
         if handle < 0:
             print("❌ Failed to open GPIO chip")
             return False
-        print("✅ GPIO chip opened successfully")
+        out.append("✅ GPIO chip opened successfully")
         
         # Test pins
         test_pins = [17, 22, 24, 27, 23, 25]
@@ -79,17 +89,20 @@ def test_lgpio_setup(lgpio_module):
                 # Claim pin as output
                 result = lgpio_module.gpio_claim_output(handle, 0, pin, 0)
                 if result == 0:
-                    print(f"✅ GPIO pin {pin} setup successful")
+                    out.append(f"✅ GPIO pin {pin} setup successful")
                 else:
+                    flush_lines(out)
                     print(f"❌ GPIO pin {pin} setup failed (error code: {result})")
                     failed_pins.append(pin)
             except Exception as e:
+                flush_lines(out)
                 print(f"❌ GPIO pin {pin} setup failed: {e}")
                 failed_pins.append(pin)
         
         # Clean up
         lgpio_module.gpiochip_close(handle)
-        print("✅ GPIO chip closed successfully")
+        out.append("✅ GPIO chip closed successfully")
+        flush_lines(out)
         
         # Return success only if all pins worked
         if failed_pins:
@@ -99,6 +112,7 @@ def test_lgpio_setup(lgpio_module):
             return True
         
     except Exception as e:
+        flush_lines(out)
         print(f"❌ Unexpected error during lgpio setup: {e}")
         return False
 
@@ -108,9 +122,10 @@ def check_system_info():
     
     # Check if we're on Raspberry Pi
     try:
-        with open('/proc/cpuinfo', 'r') as f:
+        # Bytes are enough for a substring check; no need to decode the file
+        with open('/proc/cpuinfo', 'rb') as f:
             cpuinfo = f.read()
-            if 'Raspberry Pi' in cpuinfo:
+            if b'Raspberry Pi' in cpuinfo:
                 print("✅ Running on Raspberry Pi")
             else:
                 print("⚠️  Not running on Raspberry Pi")